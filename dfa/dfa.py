@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional, Set
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
 
 from dfa.dfa_state import DFAState
 
@@ -11,24 +11,31 @@ class DFA:
     start_state: DFAState
     states: List[DFAState]
     alphabet: Set[str]
+    _sorted_alphabet: Optional[List[str]] = field(default=None, init=False, repr=False)
+    _states_by_id: Optional[Dict[int, DFAState]] = field(default=None, init=False, repr=False)
+
+    # 字母表构造后不再变化，排序结果缓存一份给展示/最小化复用
+    def sorted_alphabet(self) -> List[str]:
+        if self._sorted_alphabet is None:
+            self._sorted_alphabet = sorted(self.alphabet)
+        return self._sorted_alphabet
 
     def get_state_by_id(self, state_id: int) -> Optional[DFAState]:
-        for state in self.states:
-            if state.state_id == state_id:
-                return state
-        return None
+        if self._states_by_id is None:
+            self._states_by_id = {state.state_id: state for state in self.states}
+        return self._states_by_id.get(state_id)
 
     def __str__(self) -> str:
-        lines: List[str] = []
-        lines.append("DFA:")
-        lines.append(f"起始状态: {self.start_state.state_id}")
-        accepting = [str(s.state_id) for s in self.states if s.is_accepting]
-        lines.append("接受状态: " + " ".join(accepting))
-        lines.append(f"字母表: {sorted(self.alphabet)}")
-        lines.append("转移表:")
-        for state in self.states:
-            for symbol in sorted(state.transitions.keys()):
-                target = state.get_transition(symbol)
-                if target is not None:
-                    lines.append(f"  {state.state_id} --{symbol}--> {target.state_id}")
+        lines: List[str] = [
+            "DFA:",
+            f"起始状态: {self.start_state.state_id}",
+            "接受状态: " + " ".join(str(s.state_id) for s in self.states if s.is_accepting),
+            f"字母表: {self.sorted_alphabet()}",
+            "转移表:",
+        ]
+        lines.extend(
+            f"  {state.state_id} --{symbol}--> {state.transitions[symbol].state_id}"
+            for state in self.states
+            for symbol in sorted(state.transitions.keys())
+        )
         return "\n".join(lines)
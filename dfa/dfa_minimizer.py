@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from collections import deque
 from dataclasses import dataclass
-from typing import Deque, Dict, List, Set
+from typing import Deque, Dict, FrozenSet, List, Set, Tuple
 
 from dfa.dfa import DFA
 from dfa.dfa_state import DFAState
@@ -12,9 +12,39 @@ from dfa.dfa_state import DFAState
 class DFAMinimizer:
     def minimize(self, original_dfa: DFA) -> DFA:
         partition = self._create_initial_partition(original_dfa)
-        partition = self._hopcroft_minimization(original_dfa, partition)
+        inverse = self._build_inverse_transitions(original_dfa)
+        representatives = self._alphabet_class_representatives(original_dfa)
+        partition = self._hopcroft_minimization(representatives, partition, inverse)
         return self._build_minimized_dfa(original_dfa, partition)
 
+    # 字母表等价类：整张 DFA 上转移函数完全相同的符号划分会产生完全相同
+    # 的分裂，细化时每类只需用一个代表符号（例如标识符 DFA 里 52 个字母
+    # 共享一个转移函数）。注意：对同一 X 的细化是幂等的，跳过等价符号
+    # 不影响最终分区
+    @staticmethod
+    def _alphabet_class_representatives(dfa: DFA) -> List[str]:
+        representatives: List[str] = []
+        seen: Dict[FrozenSet[Tuple[DFAState, DFAState]], str] = {}
+        for symbol in dfa.sorted_alphabet():
+            key = frozenset(
+                (state, state.transitions[symbol])
+                for state in dfa.states
+                if symbol in state.transitions
+            )
+            if key not in seen:
+                seen[key] = symbol
+                representatives.append(symbol)
+        return representatives
+
+    # 逆转移索引：inverse[symbol][target] = 能经 symbol 转移到 target 的前驱状态列表
+    @staticmethod
+    def _build_inverse_transitions(dfa: DFA) -> Dict[str, Dict[DFAState, List[DFAState]]]:
+        inverse: Dict[str, Dict[DFAState, List[DFAState]]] = {}
+        for state in dfa.states:
+            for symbol, target in state.transitions.items():
+                inverse.setdefault(symbol, {}).setdefault(target, []).append(state)
+        return inverse
+
     @staticmethod
     def _create_initial_partition(dfa: DFA) -> List[Set[DFAState]]:
         accepting: Set[DFAState] = set()
@@ -33,77 +63,107 @@ class DFAMinimizer:
             parts.append(non_accepting)
         return parts
 
-    def _hopcroft_minimization(self, dfa: DFA, initial_partition: List[Set[DFAState]]) -> List[Set[DFAState]]:
-        work_set: Deque[Set[DFAState]] = deque(initial_partition)
-        partition: List[Set[DFAState]] = list(initial_partition)
-
-        while work_set:
-            A = work_set.popleft()
-
-            for symbol in sorted(dfa.alphabet):
-                X = self._find_predecessors(dfa, A, symbol)
+    def _hopcroft_minimization(
+        self,
+        symbols: List[str],
+        initial_partition: List[Set[DFAState]],
+        inverse: Dict[str, Dict[DFAState, List[DFAState]]],
+    ) -> List[Set[DFAState]]:
+        # 块按创建顺序分配整数编号：成员判断/删除都按编号 O(1) 完成，
+        # 不再对 deque 做按值扫描 + rotate 删除
+        blocks: Dict[int, Set[DFAState]] = {}
+        next_block_id = 0
+        for block in initial_partition:
+            blocks[next_block_id] = block
+            next_block_id += 1
+
+        # partition 记录块编号的展示顺序（与旧实现的 List[Set] 顺序一致）
+        partition: List[int] = list(blocks.keys())
+        work_ids: Deque[int] = deque(partition)
+        work_members: Set[int] = set(partition)
+
+        while work_ids:
+            a_id = work_ids.popleft()
+            if a_id not in work_members:
+                # 已在某次分裂中被替换，懒惰删除
+                continue
+            work_members.discard(a_id)
+            A = blocks[a_id]
+
+            for symbol in symbols:
+                X = self._find_predecessors(inverse, A, symbol)
                 if not X:
                     continue
 
-                new_partition: List[Set[DFAState]] = []
+                new_partition: List[int] = []
                 changed = False
 
-                for Y in partition:
-                    Y1: Set[DFAState] = set()
-                    Y2: Set[DFAState] = set()
-
-                    for state in Y:
-                        (Y1 if state in X else Y2).add(state)
-
-                    if Y1 and Y2:
-                        new_partition.append(Y1)
-                        new_partition.append(Y2)
-                        changed = True
-
-                        # Python 的 set 无法直接判断“contains Y”是否同一对象，
-                        idx_to_remove = None
-                        for idx, item in enumerate(work_set):
-                            if item == Y:
-                                idx_to_remove = idx
-                                break
-                        if idx_to_remove is not None:
-                            # 移除该元素
-                            work_set.rotate(-idx_to_remove)
-                            work_set.popleft()
-                            work_set.rotate(idx_to_remove)
-                            work_set.append(Y1)
-                            work_set.append(Y2)
-                        else:
-                            work_set.append(Y1 if len(Y1) <= len(Y2) else Y2)
+                for y_id in partition:
+                    Y = blocks[y_id]
+                    # 交集为空或等于 Y 都不分裂；Y2 只在真的分裂时才构造，
+                    # 避免给每个块白白分配两个集合再逐元素填充
+                    Y1 = Y & X
+                    if not Y1 or len(Y1) == len(Y):
+                        new_partition.append(y_id)
+                        continue
+                    Y2 = Y - X
+
+                    del blocks[y_id]
+                    id1 = next_block_id
+                    id2 = next_block_id + 1
+                    next_block_id += 2
+                    blocks[id1] = Y1
+                    blocks[id2] = Y2
+                    new_partition.append(id1)
+                    new_partition.append(id2)
+                    changed = True
+
+                    # Hopcroft 不变式：Y 仍在工作集中 => 用两半替换之；
+                    # 否则只压入较小的一半（"smaller half" 规则），
+                    # 这是 O(α·n·log n) 上界的关键
+                    if y_id in work_members:
+                        work_members.discard(y_id)
+                        work_ids.append(id1)
+                        work_ids.append(id2)
+                        work_members.add(id1)
+                        work_members.add(id2)
                     else:
-                        new_partition.append(Y)
+                        smaller = id1 if len(Y1) <= len(Y2) else id2
+                        work_ids.append(smaller)
+                        work_members.add(smaller)
 
                 if changed:
                     partition = new_partition
 
-        return partition
+        return [blocks[block_id] for block_id in partition]
 
     # 找出所有能通过 symbol 转移到 target_set 中状态的前驱状态
     @staticmethod
-    def _find_predecessors(dfa: DFA, target_set: Set[DFAState], symbol: str) -> Set[DFAState]:
+    def _find_predecessors(
+        inverse: Dict[str, Dict[DFAState, List[DFAState]]],
+        target_set: Set[DFAState],
+        symbol: str,
+    ) -> Set[DFAState]:
         predecessors: Set[DFAState] = set()
-        for state in dfa.states:
-            nxt = state.get_transition(symbol)
-            if nxt is not None and nxt in target_set:
-                predecessors.add(state)
+        by_target = inverse.get(symbol)
+        if by_target is None:
+            return predecessors
+        for target in target_set:
+            preds = by_target.get(target)
+            if preds:
+                predecessors.update(preds)
         return predecessors
 
     @staticmethod
     def _get_nfa_states_union(states: Set[DFAState]) -> Set[int]:
         union: Set[int] = set()
         for state in states:
-            union |= set(state.nfa_states)
+            union.update(state.nfa_states)
         return union
 
     def _build_minimized_dfa(self, original_dfa: DFA, final_partition: List[Set[DFAState]]) -> DFA:
         state_mapping: Dict[DFAState, DFAState] = {}
         new_states: List[DFAState] = []
-        block_to_state: Dict[frozenset[DFAState], DFAState] = {}
 
         new_state_id = 0
         for block in final_partition:
@@ -112,18 +172,17 @@ class DFAMinimizer:
             new_state.is_accepting = any(s.is_accepting for s in block)
 
             new_states.append(new_state)
-            block_to_state[frozenset(block)] = new_state
 
             for old_state in block:
                 state_mapping[old_state] = new_state
 
-        # 建转移：选 block 内任一代表状态即可
-        for block in final_partition:
+        # 建转移：选 block 内任一代表状态即可（block 与 new_states 按下标配对，
+        # 不必再用 frozenset(block) 作键回查）
+        for block, new_state in zip(final_partition, new_states):
             # 选择 state_id 最小的作为代表，保证输出稳定
             rep = min(block, key=lambda s: s.state_id)
-            new_state = block_to_state[frozenset(block)]
 
-            for symbol in sorted(original_dfa.alphabet):
+            for symbol in original_dfa.sorted_alphabet():
                 old_target = rep.get_transition(symbol)
                 if old_target is None:
                     continue
@@ -26,11 +26,3 @@ class DFAState:
     def __str__(self) -> str:
         accept = "[ACCEPT]" if self.is_accepting else ""
         return f"DFAState{self.state_id}{sorted(self.nfa_states)}{accept}"
-
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, DFAState):
-            return False
-        return self.nfa_states == other.nfa_states
-
-    def __hash__(self) -> int:
-        return hash(frozenset(self.nfa_states))
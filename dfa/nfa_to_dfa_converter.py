@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from collections import deque
 from dataclasses import dataclass
-from typing import Deque, Dict, FrozenSet, List, Set, Tuple
+from typing import Deque, Dict, List, Set, Tuple
 
 from nfa.nfa import NFA
 from nfa.nfa_node import NFANode
@@ -16,6 +16,8 @@ class NFAToDFAConverter:
 
     def __post_init__(self) -> None:
         self._node_by_id, self._alphabet = self._index_nfa(self.nfa)
+        self._eps_closure = self._compute_epsilon_closures()
+        self._move_table = self._compute_move_table()
         self._dfa_state_counter: int = 0
 
     @staticmethod
@@ -44,77 +46,102 @@ class NFAToDFAConverter:
 
         return node_by_id, symbols
 
-    def _epsilon_closure(self, states: Set[int]) -> Set[int]:
-        closure: Set[int] = set(states)
-        stack: Deque[int] = deque(states)
+    def _compute_epsilon_closures(self) -> Dict[int, int]:
+        """预计算每个结点的 ε-闭包（NFA 构建后是静态的，只需算一次）。
 
-        while stack:
-            state_id = stack.pop()
-            node = self._node_by_id.get(state_id)
-            if node is None:
-                continue
-
-            # 仅当 node.path_char 为 None 时，next_nodes 才当 ε 边
-            if node.path_char is None:
-                for nxt in node.next_nodes:
-                    if nxt.state_id not in closure:
-                        closure.add(nxt.state_id)
-                        stack.append(nxt.state_id)
-
-        return closure
-
-    def _move(self, states: Set[int], symbol: str) -> Set[int]:
-        result: Set[int] = set()
-        for state_id in states:
-            node = self._node_by_id.get(state_id)
-            if node is None:
+        闭包用整数位集表示：第 sid 位为 1 表示包含结点 sid，
+        并集/判等都退化为整数位运算。
+        """
+        closures: Dict[int, int] = {}
+        for start_id in self._node_by_id:
+            closure: Set[int] = {start_id}
+            stack: Deque[int] = deque([start_id])
+
+            while stack:
+                state_id = stack.pop()
+                node = self._node_by_id[state_id]
+
+                # 仅当 node.path_char 为 None 时，next_nodes 才当 ε 边
+                if node.path_char is None:
+                    for nxt in node.next_nodes:
+                        if nxt.state_id not in closure:
+                            closure.add(nxt.state_id)
+                            stack.append(nxt.state_id)
+
+            bits = 0
+            for state_id in closure:
+                bits |= 1 << state_id
+            closures[start_id] = bits
+        return closures
+
+    def _compute_move_table(self) -> Dict[str, Dict[int, int]]:
+        """预计算 move∘εclosure：move_table[sym][sid] = ε-closure(move({sid}, sym))。
+
+        子集构造的内层循环因此退化为若干次整数按位或。
+        """
+        move_table: Dict[str, Dict[int, int]] = {}
+        for state_id, node in self._node_by_id.items():
+            symbol = node.path_char
+            if symbol is None:
                 continue
+            targets = 0
+            for nxt in node.next_nodes:
+                targets |= self._eps_closure[nxt.state_id]
+            move_table.setdefault(symbol, {})[state_id] = targets
+        return move_table
 
-            if node.path_char is not None and node.path_char == symbol:
-                for nxt in node.next_nodes:
-                    result.add(nxt.state_id)
-
-        return result
+    @staticmethod
+    def _bits_to_set(bits: int) -> Set[int]:
+        out: Set[int] = set()
+        while bits:
+            low = bits & -bits
+            out.add(low.bit_length() - 1)
+            bits ^= low
+        return out
 
-    def _contains_accepting_state(self, states: Set[int]) -> bool:
-        return self.nfa.end_node.state_id in states
+    def _contains_accepting_state(self, bits: int) -> bool:
+        return (bits >> self.nfa.end_node.state_id) & 1 == 1
 
     def convert_to_dfa(self) -> DFA:
         dfa_states: List[DFAState] = []
-        state_map: Dict[FrozenSet[int], DFAState] = {}
+        # 子集直接用位集整数作键，省去 frozenset 构造与哈希
+        state_map: Dict[int, DFAState] = {}
         unprocessed: Deque[DFAState] = deque()
 
-        start_nfa_states = {self.nfa.start_node.state_id}
-        start_closure = self._epsilon_closure(start_nfa_states)
-        start_key = frozenset(start_closure)
+        start_bits = self._eps_closure[self.nfa.start_node.state_id]
 
-        start_state = DFAState(self._dfa_state_counter, set(start_closure))
+        start_state = DFAState(self._dfa_state_counter, self._bits_to_set(start_bits))
         self._dfa_state_counter += 1
-        start_state.is_accepting = self._contains_accepting_state(start_closure)
+        start_state.is_accepting = self._contains_accepting_state(start_bits)
 
         dfa_states.append(start_state)
-        state_map[start_key] = start_state
+        state_map[start_bits] = start_state
         unprocessed.append(start_state)
 
+        sorted_symbols = sorted(self._alphabet)
+
         while unprocessed:
             # FIFO + sorted alphabet => deterministic state discovery/order
             current = unprocessed.popleft()
 
-            for symbol in sorted(self._alphabet):
-                moved = self._move(current.nfa_states, symbol)
-                if not moved:
+            for symbol in sorted_symbols:
+                per_state = self._move_table[symbol]
+                new_bits = 0
+                for state_id in current.nfa_states:
+                    targets = per_state.get(state_id)
+                    if targets:
+                        new_bits |= targets
+                if not new_bits:
                     continue
 
-                new_closure = self._epsilon_closure(moved)
-                key = frozenset(new_closure)
-                new_state = state_map.get(key)
+                new_state = state_map.get(new_bits)
 
                 if new_state is None:
-                    new_state = DFAState(self._dfa_state_counter, set(new_closure))
+                    new_state = DFAState(self._dfa_state_counter, self._bits_to_set(new_bits))
                     self._dfa_state_counter += 1
-                    new_state.is_accepting = self._contains_accepting_state(new_closure)
+                    new_state.is_accepting = self._contains_accepting_state(new_bits)
                     dfa_states.append(new_state)
-                    state_map[key] = new_state
+                    state_map[new_bits] = new_state
                     unprocessed.append(new_state)
 
                 current.add_transition(symbol, new_state)
@@ -1,23 +1,66 @@
 from __future__ import annotations
 
+from array import array
 from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 
 from dfa.dfa import DFA
-from dfa.dfa_state import DFAState
 from dfa.dfa_minimizer import DFAMinimizer
 from dfa.nfa_to_dfa_converter import NFAToDFAConverter
 from nfa.nfa_builder import NFABuilder
 from lexer.token import Token
 
 
+@dataclass(frozen=True)
+class _CompiledDFA:
+    """DFA 的紧凑执行形式：状态/符号都映射为小整数。
+
+    transitions[state][symbol_class] 给出后继状态编号，-1 表示无转移；
+    匹配循环只做 list 下标访问，避免逐状态对象的 dict 查找。
+    """
+
+    symbol_index: Dict[str, int]
+    transitions: List[List[int]]
+    accepting: List[bool]
+    start: int
+
+
+@dataclass(frozen=True)
+class _MergedDFA:
+    """把所有 token 的 DFA 乘积合并成一台多接受态扫描机。
+
+    accept_token[state] 给出该状态接受的 token 类型（按 patterns 的
+    声明顺序取优先级最高者），None 表示非接受态。一次扫描即可得到
+    所有 token 类型里的最长匹配，不必逐类型各跑一遍。
+
+    转移表拉平成一维 array('i')，下标 state * num_symbols + symbol_class，
+    扫描循环只剩纯整数下标运算。
+    """
+
+    symbol_index: Dict[str, int]
+    transitions: "array[int]"
+    num_symbols: int
+    accept_token: List[Optional[str]]
+    start: int
+
+
+# 模式集 -> 已构建自动机 的进程内缓存：同一进程里重复创建 DFALexer 时
+# 不必再走一遍 正规式 -> NFA -> DFA -> 最小化 -> 编译/合并 流水线
+_AUTOMATA_CACHE: Dict[
+    Tuple[Tuple[str, str], ...],
+    Tuple["OrderedDict[str, DFA]", "OrderedDict[str, _CompiledDFA]", Optional[_MergedDFA]],
+] = {}
+
+
 @dataclass
 class DFALexer:
     token_dfas: Dict[str, DFA] = field(default_factory=OrderedDict)
     patterns: "OrderedDict[str, str]" = field(default_factory=OrderedDict)
     verbose_build: bool = True
     build_log: List[str] = field(default_factory=list, init=False)
+    _compiled: Dict[str, _CompiledDFA] = field(default_factory=OrderedDict, init=False)
+    _merged: Optional[_MergedDFA] = field(default=None, init=False)
 
     def __post_init__(self) -> None:
         self._initialize_dfas()
@@ -63,6 +106,16 @@ class DFALexer:
         # 保存一份，用于外部导出展示
         self.patterns = patterns
 
+        cache_key = tuple(patterns.items())
+        cached = _AUTOMATA_CACHE.get(cache_key)
+        if cached is not None:
+            token_dfas, compiled, merged = cached
+            self.token_dfas.update(token_dfas)
+            self._compiled.update(compiled)
+            self._merged = merged
+            self._log_build("[规则装配] 命中自动机缓存，跳过重建")
+            return
+
         nfa_builder = NFABuilder()
 
         for token_type, pattern in patterns.items():
@@ -76,10 +129,21 @@ class DFALexer:
                 minimized = DFAMinimizer().minimize(dfa)
                 self._log_build(f"  ✓ DFA 最小化完成（状态数: {len(minimized.states)}）")
                 self.token_dfas[token_type] = minimized
+                self._compiled[token_type] = self._compile_dfa(minimized)
                 self._log_build(f"  ✅ {token_type} 自动机就绪")
             except Exception as e:
                 self._log_build(f"  ❌ {token_type} 自动机构建失败: {e}")
 
+        if self._compiled:
+            self._merged = self._merge_compiled(self._compiled)
+            self._log_build(f"\n[规则装配] 多接受态合并DFA就绪（状态数: {len(self._merged.accept_token)}）")
+
+        _AUTOMATA_CACHE[cache_key] = (
+            OrderedDict(self.token_dfas),
+            OrderedDict(self._compiled),
+            self._merged,
+        )
+
     def dump_patterns_and_dfas(self) -> str:
         lines: List[str] = []
         lines.append("========================================\n")
@@ -112,16 +176,24 @@ class DFALexer:
         line = 1
         column = 1
 
-        while position < len(source_code):
+        n = len(source_code)
+        while position < n:
             current_char = source_code[position]
 
             if current_char.isspace():
-                if current_char == "\n":
-                    line += 1
-                    column = 1
+                # 整段空白一次跳过：行号按 '\n' 个数增加，列号取最后一个
+                # 换行之后的偏移
+                end = position + 1
+                while end < n and source_code[end].isspace():
+                    end += 1
+                whitespace = source_code[position:end]
+                newlines = whitespace.count("\n")
+                if newlines:
+                    line += newlines
+                    column = len(whitespace) - whitespace.rfind("\n")
                 else:
-                    column += 1
-                position += 1
+                    column += len(whitespace)
+                position = end
                 continue
 
             token: Optional[Token]
@@ -180,39 +252,128 @@ class DFALexer:
             end += 1
         return Token("ERROR", source_code[start:end], line, column)
 
+    @staticmethod
+    def _compile_dfa(dfa: DFA) -> _CompiledDFA:
+        state_index = {state: i for i, state in enumerate(dfa.states)}
+        symbol_index = {symbol: k for k, symbol in enumerate(sorted(dfa.alphabet))}
+
+        transitions = [[-1] * len(symbol_index) for _ in dfa.states]
+        for state, i in state_index.items():
+            row = transitions[i]
+            for symbol, target in state.transitions.items():
+                row[symbol_index[symbol]] = state_index[target]
+
+        accepting = [state.is_accepting for state in dfa.states]
+        return _CompiledDFA(
+            symbol_index=symbol_index,
+            transitions=transitions,
+            accepting=accepting,
+            start=state_index[dfa.start_state],
+        )
+
+    @staticmethod
+    def _merge_compiled(compiled: Dict[str, _CompiledDFA]) -> _MergedDFA:
+        """乘积构造：把各 token 的 DFA 并成一台，惰性发现可达乘积状态。"""
+        token_types = list(compiled)
+        machines = [compiled[t] for t in token_types]
+
+        symbols = sorted(set().union(*(m.symbol_index.keys() for m in machines)))
+        symbol_index = {symbol: k for k, symbol in enumerate(symbols)}
+        # 每台机器：全局符号列 -> 本机符号列（-1 表示本机字母表中没有该符号）
+        local_cols = [[m.symbol_index.get(symbol, -1) for symbol in symbols] for m in machines]
+
+        start_key = tuple(m.start for m in machines)
+        state_index: Dict[Tuple[int, ...], int] = {start_key: 0}
+        pending = [start_key]
+
+        transitions: List[List[int]] = []
+        accept_token: List[Optional[str]] = []
+
+        qi = 0
+        while qi < len(pending):
+            current = pending[qi]
+            qi += 1
+
+            # 接受该状态的 token：按 patterns 声明顺序取第一个（优先级）
+            token: Optional[str] = None
+            for mi, s in enumerate(current):
+                if s >= 0 and machines[mi].accepting[s]:
+                    token = token_types[mi]
+                    break
+            accept_token.append(token)
+
+            row: List[int] = []
+            for k in range(len(symbols)):
+                nxt: List[int] = []
+                alive = False
+                for mi, s in enumerate(current):
+                    if s < 0:
+                        nxt.append(-1)
+                        continue
+                    col = local_cols[mi][k]
+                    target = machines[mi].transitions[s][col] if col >= 0 else -1
+                    nxt.append(target)
+                    if target >= 0:
+                        alive = True
+
+                if not alive:
+                    row.append(-1)
+                    continue
+
+                key = tuple(nxt)
+                j = state_index.get(key)
+                if j is None:
+                    j = len(pending)
+                    state_index[key] = j
+                    pending.append(key)
+                row.append(j)
+            transitions.append(row)
+
+        flat = array("i")
+        for row in transitions:
+            flat.extend(row)
+
+        return _MergedDFA(
+            symbol_index=symbol_index,
+            transitions=flat,
+            num_symbols=len(symbols),
+            accept_token=accept_token,
+            start=0,
+        )
+
     def _find_longest_match(self, source_code: str, start: int, line: int, column: int) -> Optional[Token]:
-        best_type: Optional[str] = None
-        best_lexeme: Optional[str] = None
-        max_length = 0
-
-        for token_type, dfa in self.token_dfas.items():
-            matched = self._run_dfa(dfa, source_code, start)
-            if matched is not None and len(matched) > max_length:
-                max_length = len(matched)
-                best_type = token_type
-                best_lexeme = matched
-
-        if best_type is not None and best_lexeme is not None:
-            return Token(best_type, best_lexeme, line, column)
+        if self._merged is None:
+            return None
+        matched_len, best_type = self._run_dfa(self._merged, source_code, start)
+        if best_type is not None:
+            return Token(best_type, source_code[start : start + matched_len], line, column)
         return None
 
     @staticmethod
-    def _run_dfa(dfa: DFA, input_text: str, start: int) -> Optional[str]:
-        current_state: DFAState = dfa.start_state
-        matched_chars: List[str] = []
+    def _run_dfa(merged: _MergedDFA, input_text: str, start: int) -> Tuple[int, Optional[str]]:
+        """返回从 start 起的最长接受前缀长度与对应 token 类型。"""
+        symbol_index = merged.symbol_index
+        transitions = merged.transitions
+        num_symbols = merged.num_symbols
+        accept_token = merged.accept_token
+
+        state = merged.start
         position = start
-        last_accepting: Optional[str] = None
+        matched_len = 0
+        best_type: Optional[str] = None
+        n = len(input_text)
 
-        while position < len(input_text):
-            c = input_text[position]
-            next_state = current_state.get_transition(c)
-            if next_state is None:
+        while position < n:
+            k = symbol_index.get(input_text[position])
+            if k is None:
+                break
+            state = transitions[state * num_symbols + k]
+            if state < 0:
                 break
-
-            matched_chars.append(c)
-            current_state = next_state
-            if current_state.is_accepting:
-                last_accepting = "".join(matched_chars)
             position += 1
+            token = accept_token[state]
+            if token is not None:
+                matched_len = position - start
+                best_type = token
 
-        return last_accepting
+        return matched_len, best_type
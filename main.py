@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import locale
+import os
 import sys
 import time
+from collections import Counter
 from pathlib import Path
 from typing import List, Optional
 
@@ -17,6 +19,9 @@ from parser.rd_parser import RDParser
 from parser.ll1_sets import build_default_ll1_sets, format_ll1_sets
 from parser.stream import TokenStream, normalize_tokens
 
+# 读取源文件用的缓冲区大小：大文件时减少 read 系统调用次数
+_READ_BUFFER_SIZE = 256 * 1024
+
 
 def prompt_for_file_path() -> str:
     return input("请输入源文件路径（相对项目根目录或绝对路径均可）:\n> ").strip()
@@ -55,19 +60,25 @@ def resolve_file_path(file_path: str) -> Optional[Path]:
         return None
 
 
+# BOM 表：按检测顺序排列（utf-16 在 utf-32 之前，与原逐条判断的优先级一致）
+_BOMS = (
+    (b"\xEF\xBB\xBF", "utf-8-sig"),
+    (b"\xFE\xFF", "utf-16-be"),
+    (b"\xFF\xFE", "utf-16-le"),
+    (b"\x00\x00\xFE\xFF", "utf-32-be"),
+    (b"\xFF\xFE\x00\x00", "utf-32-le"),
+)
+
+
 def detect_file_encoding(path: Path) -> Optional[str]:
     try:
-        data = path.open("rb").read(4)
-        if len(data) >= 3 and data[0:3] == b"\xEF\xBB\xBF":
-            return "utf-8-sig"
-        if len(data) >= 2 and data[0:2] == b"\xFE\xFF":
-            return "utf-16-be"
-        if len(data) >= 2 and data[0:2] == b"\xFF\xFE":
-            return "utf-16-le"
-        if len(data) >= 4 and data[0:4] == b"\x00\x00\xFE\xFF":
-            return "utf-32-be"
-        if len(data) >= 4 and data[0:4] == b"\xFF\xFE\x00\x00":
-            return "utf-32-le"
+        # buffering=0：只嗅探 4 字节，不必构造 8KiB 的 BufferedReader；
+        # with 同时保证 fd 及时关闭（原实现把句柄留给了 GC）
+        with path.open("rb", buffering=0) as f:
+            data = f.read(4)
+        for bom, encoding in _BOMS:
+            if data.startswith(bom):
+                return encoding
     except Exception:
         pass
     return None
@@ -81,11 +92,12 @@ def read_source_file(path: Path) -> Optional[str]:
         if encoding is None:
             encoding = locale.getpreferredencoding(False) or "utf-8"
 
-        with path.open("r", encoding=encoding) as f:
-            lines = f.readlines()
+        with path.open("r", encoding=encoding, buffering=_READ_BUFFER_SIZE) as f:
+            content = f.read()
 
-        print(f"读取行数: {len(lines)}")
-        content = "".join(lines)
+        # 与 readlines() 的行数口径一致：末尾无换行的最后一行也算一行
+        line_count = content.count("\n") + (1 if content and not content.endswith("\n") else 0)
+        print(f"读取行数: {line_count}")
         if content.endswith("\n"):
             content = content[:-1]
         return content
@@ -121,36 +133,38 @@ def get_ll1_sets_output_file_path(source_file: Path) -> Path:
     return source_file.with_name(f"{base}_FIRST_FOLLOW_SELECT.txt")
 
 
+class _EscapeTable(dict):
+    """str.translate 用的转义表：未命中的码点首次计算后记忆，之后全程走 C 循环。"""
+
+    def __missing__(self, code: int) -> str:
+        escaped = f"\\u{code:04x}" if code < 32 or code > 126 else chr(code)
+        self[code] = escaped
+        return escaped
+
+
+_ESCAPE_TABLE = _EscapeTable(
+    {
+        ord("\n"): "\\n",
+        ord("\t"): "\\t",
+        ord("\r"): "\\r",
+        ord("\b"): "\\b",
+        ord("\f"): "\\f",
+        ord('"'): '\\"',
+        ord("'"): "\\'",
+        ord("\\"): "\\\\",
+    }
+)
+
+
+# 预绑定的 token 行模板：避免循环里每次重新解析 f-string 的格式说明
+_line_fmt = "行{:4d}, 列{:3d} | {:<15s} | {}\n".format
+
+
 def format_lexeme_for_display(lexeme: Optional[str]) -> str:
     if not lexeme:
         return "[空]"
 
-    out: List[str] = []
-    for c in lexeme:
-        if c == "\n":
-            out.append("\\n")
-        elif c == "\t":
-            out.append("\\t")
-        elif c == "\r":
-            out.append("\\r")
-        elif c == "\b":
-            out.append("\\b")
-        elif c == "\f":
-            out.append("\\f")
-        elif c == '"':
-            out.append('\\"')
-        elif c == "'":
-            out.append("\\'")
-        elif c == "\\":
-            out.append("\\\\")
-        else:
-            code = ord(c)
-            if code < 32 or code > 126:
-                out.append(f"\\u{code:04x}")
-            else:
-                out.append(c)
-
-    formatted = "".join(out)
+    formatted = lexeme.translate(_ESCAPE_TABLE)
     if len(formatted) > 50:
         return formatted[:47] + "..."
     return formatted
@@ -165,61 +179,31 @@ def print_and_save_results(tokens: List[Token], output_file_path: Path, source_f
         "========================================\n\n"
     )
 
-    console_output: List[str] = [title]
-    file_output: List[str] = [title]
+    # 控制台与文件内容完全一致：只组装一份，最后一次性输出/写入
+    output: List[str] = [title]
 
-    token_count = 0
-    error_count = 0
-    keyword_count = 0
-    identifier_count = 0
-    integer_count = 0
-    float_count = 0
-    operator_count = 0
-    delimiter_count = 0
-    string_count = 0
+    # 按类型计数走 Counter 的 C 实现，主循环只负责逐行排版
+    type_counts = Counter(token.type for token in tokens)
+    token_count = len(tokens)
+    error_count = type_counts.get("ERROR", 0)
 
     current_line = -1
 
     for token in tokens:
-        token_count += 1
-
         if token.line != current_line:
             if current_line != -1:
-                sep = "────────────────────────────────────────\n"
-                console_output.append(sep)
-                file_output.append(sep)
+                output.append("────────────────────────────────────────\n")
             current_line = token.line
 
-        if token.type == "KEYWORD":
-            keyword_count += 1
-        elif token.type == "IDENTIFIER":
-            identifier_count += 1
-        elif token.type == "INTEGER":
-            integer_count += 1
-        elif token.type == "FLOAT":
-            float_count += 1
-        elif token.type == "OPERATOR":
-            operator_count += 1
-        elif token.type == "DELIMITER":
-            delimiter_count += 1
-        elif token.type == "STRING":
-            string_count += 1
-        elif token.type == "ERROR":
-            error_count += 1
-
-        line_str = f"行{token.line:4d}, 列{token.column:3d} | {token.type:<15s} | {format_lexeme_for_display(token.lexeme)}\n"
-        console_output.append(line_str)
-        file_output.append(line_str)
+        output.append(
+            _line_fmt(token.line, token.column, token.type, format_lexeme_for_display(token.lexeme))
+        )
 
         if token.type == "ERROR":
-            err = f"           ⚠ 错误: 无法识别的符号 '{token.lexeme}'\n"
-            console_output.append(err)
-            file_output.append(err)
+            output.append(f"           ⚠ 错误: 无法识别的符号 '{token.lexeme}'\n")
 
     if current_line != -1:
-        sep = "────────────────────────────────────────\n"
-        console_output.append(sep)
-        file_output.append(sep)
+        output.append("────────────────────────────────────────\n")
 
     stats = (
         "\n========================================\n"
@@ -227,13 +211,13 @@ def print_and_save_results(tokens: List[Token], output_file_path: Path, source_f
         "========================================\n"
         f"总Token数:     {token_count:8d}\n"
         "────────────────────────────────────────\n"
-        f"关键字:        {keyword_count:8d}\n"
-        f"标识符:        {identifier_count:8d}\n"
-        f"整数:          {integer_count:8d}\n"
-        f"小数:          {float_count:8d}\n"
-        f"运算符:        {operator_count:8d}\n"
-        f"分隔符:        {delimiter_count:8d}\n"
-        f"字符串:        {string_count:8d}\n"
+        f"关键字:        {type_counts.get('KEYWORD', 0):8d}\n"
+        f"标识符:        {type_counts.get('IDENTIFIER', 0):8d}\n"
+        f"整数:          {type_counts.get('INTEGER', 0):8d}\n"
+        f"小数:          {type_counts.get('FLOAT', 0):8d}\n"
+        f"运算符:        {type_counts.get('OPERATOR', 0):8d}\n"
+        f"分隔符:        {type_counts.get('DELIMITER', 0):8d}\n"
+        f"字符串:        {type_counts.get('STRING', 0):8d}\n"
         "────────────────────────────────────────\n"
         f"错误Token:     {error_count:8d}\n"
         f"错误率:        {(error_count * 100.0 / token_count) if token_count else 0.0:8.2f}%\n"
@@ -241,13 +225,13 @@ def print_and_save_results(tokens: List[Token], output_file_path: Path, source_f
         "分析完成。\n"
     )
 
-    console_output.append(stats)
-    file_output.append(stats)
+    output.append(stats)
 
-    print("".join(console_output), end="")
+    text = "".join(output)
+    print(text, end="")
 
     try:
-        output_file_path.write_text("".join(file_output), encoding="utf-8")
+        output_file_path.write_text(text, encoding="utf-8")
         print(f"\n结果已保存到: {output_file_path.resolve()}")
         print(f"文件大小: {output_file_path.stat().st_size} 字节")
     except Exception as e:
@@ -255,7 +239,7 @@ def print_and_save_results(tokens: List[Token], output_file_path: Path, source_f
         print("尝试保存到备用位置...")
         try:
             backup = Path(f"lexer_output_{int(time.time() * 1000)}.txt")
-            backup.write_text("".join(file_output), encoding="utf-8")
+            backup.write_text(text, encoding="utf-8")
             print(f"结果已保存到备用位置: {backup}")
         except Exception as ex:
             print(f"备用保存也失败: {ex}")
@@ -284,10 +268,8 @@ def main(argv: List[str]) -> int:
         print(f"错误: 路径不是文件 - {source_file.resolve()}")
         return 1
 
-    try:
-        with source_file.open("rb"):
-            pass
-    except Exception:
+    # 只是确认可读性，一次 access(2) 即可，不必真的 open/close 一遍
+    if not os.access(source_file, os.R_OK):
         print(f"错误: 无法读取文件 - {source_file.resolve()}")
         return 1
 
@@ -327,6 +309,8 @@ def main(argv: List[str]) -> int:
 
     syntax_tokens = normalize_tokens(tokens, drop_error_tokens=True)
     parser = RDParser(TokenStream(syntax_tokens))
+    # 报告需要教学用的赋值语句分析表，显式打开（默认关闭以省去展示开销）
+    parser.enable_assign_table = True
     start2 = time.time()
     result = parser.parse_program()
     end2 = time.time()
@@ -357,17 +341,16 @@ def main(argv: List[str]) -> int:
             rd_log_text.append("            语法错误\n")
             rd_log_text.append("========================================\n\n")
             rd_log_text.append("\n".join(str(e) for e in result.errors))
-        rd_log_path.write_text("".join(rd_log_text), encoding="utf-8")
+        # writelines 直接逐段写出，省掉 join 拼出整份日志的瞬时大字符串
+        with rd_log_path.open("w", encoding="utf-8", buffering=_READ_BUFFER_SIZE) as f:
+            f.writelines(rd_log_text)
         print(f"递归下降日志已保存到: {rd_log_path.resolve()}")
     except Exception as e:
         print(f"保存递归下降日志失败: {e}")
 
     tac_report_path = get_tac_output_file_path(source_file)
     try:
-        tac_report_path.write_text(
-            result.emitter.as_text() + "\n\n" + result.emitter.as_quads_text(),
-            encoding="utf-8",
-        )
+        tac_report_path.write_text(result.emitter.as_report_text(), encoding="utf-8")
         print(f"三地址码/四元式已保存到: {tac_report_path.resolve()}")
     except Exception as e:
         print(f"保存三地址码/四元式失败: {e}")
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
 
 from nfa.nfa_node import NFANode
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NFA:
     """NFA 结构：起始结点与结束结点。"""
 
@@ -18,10 +19,10 @@ class NFA:
     def visualize(self) -> None:
         """打印 NFA 的所有状态和转移关系"""
         visited = set()
-        queue = [self.start_node]
+        queue = deque([self.start_node])
         print("NFA 状态转移：")
         while queue:
-            node = queue.pop(0)
+            node = queue.popleft()
             if node.state_id in visited:
                 continue
             visited.add(node.state_id)
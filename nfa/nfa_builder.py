@@ -1,225 +1,293 @@
 from __future__ import annotations
 
-from collections import deque
-from dataclasses import dataclass, field
-from typing import Deque, List
+from itertools import count
+from typing import Callable, Dict, List, Tuple
 
 from nfa.nfa import NFA
 from nfa.nfa_node import NFANode
 
 
-@dataclass
-class NFABuilder:
+# 中缀转后缀用的字符分类码：表里查不到的字符一律按操作数处理
+_C_OPERAND, _C_PIPE, _C_STAR, _C_CONCAT, _C_LPAREN, _C_RPAREN, _C_ESCAPE, _C_END = range(8)
+
+# 正规式 -> 已构建 NFA 的缓存：构建完成后 NFA 只被读取（子集构造），
+# 同一正规式重复 build_nfa 时直接复用
+_NFA_CACHE: Dict[str, NFA] = {}
+_CHAR_CLASS = {
+    "|": _C_PIPE,
+    "*": _C_STAR,
+    "~": _C_CONCAT,
+    "(": _C_LPAREN,
+    ")": _C_RPAREN,
+    "\\": _C_ESCAPE,
+    "#": _C_END,
+}
+
+# 运算符优先级表：*为闭包，~为连接，|为或；查不到的（括号等）按 0 处理
+_PRIORITY = {"*": 3, "~": 2, "|": 1}
+
+# 后缀序列用 bytearray 存操作码：0-2 是运算符，>=_OP_BASE 的是字面量表下标。
+# 单字符 str 约 49 字节，字节码只占 1 字节，长正规式的缓存足迹小得多
+_OP_PIPE, _OP_CONCAT, _OP_STAR = range(3)
+_OP_BASE = 3
+_OPCODES = {"|": _OP_PIPE, "~": _OP_CONCAT, "*": _OP_STAR}
+
+
+def _parse_escape_token(token: str) -> str:
+    # token 可能是 "\\n" 或 "a" 或 "\\|"
+    if len(token) > 1 and token.startswith("\\"):
+        esc = token[1]
+        if esc == "n":
+            return "\n"
+        if esc == "t":
+            return "\t"
+        if esc == "r":
+            return "\r"
+        if esc == "0":
+            return "\0"
+        return esc
+    return token[0]
+
+
+# 中缀表达式转后缀表达式（转义在此处解析，输出为操作码字节 + 字面量表）
+def _infix_to_postfix(regex: str) -> Tuple[bytearray, List[str]]:
+    processed = regex + "#"
+    output = bytearray()
+    literals: List[str] = []
+    lit_index: Dict[str, int] = {}
+    # 运算符栈只在栈顶 append/pop，局部 list 即可，无跨调用状态
+    op_stack: List[str] = []
+    # 热循环里把全局属性绑定为局部变量，LOAD_FAST 比 LOAD_ATTR 便宜得多
+    char_class = _CHAR_CLASS.get
+    priority = _PRIORITY.get
+    out_append = output.append
+    concat_prio = _PRIORITY["~"]
+
+    def lit_code(ch: str) -> int:
+        code = lit_index.get(ch)
+        if code is None:
+            code = _OP_BASE + len(literals)
+            if code > 0xFF:
+                raise ValueError(f"Too many distinct literals in regex: {regex}")
+            lit_index[ch] = code
+            literals.append(ch)
+        return code
+
+    # 隐式连接：按优先级弹出栈顶后压入 '~'
+    def push_concat() -> None:
+        while op_stack and priority(op_stack[-1], 0) >= concat_prio:
+            out_append(_OPCODES[op_stack.pop()])
+        op_stack.append("~")
+
+    i = 0
+    n = len(processed)
+    # 上一个 token 之后是否允许隐式连接（操作数/')'/'*' 之后为 True）。
+    # 初始为 False：表达式开头不会错误地插入连接符 ~
+    prev_concat = False
+
+    while i < n:
+        current = processed[i]
+        cls = char_class(current, _C_OPERAND)
+
+        # 1) 处理转义字符
+        if cls == _C_ESCAPE:
+            if prev_concat:
+                push_concat()
+
+            if i + 1 < n:
+                # 转义序列视为普通字符
+                out_append(lit_code(_parse_escape_token("\\" + processed[i + 1])))
+                i += 2
+            else:
+                # 非法：以 \\ 结尾，当作普通 \\ 处理
+                out_append(lit_code("\\"))
+                i += 1
+            prev_concat = True
+            continue
+
+        # 2) 普通字符
+        if cls == _C_OPERAND:
+            if prev_concat:
+                push_concat()
+            out_append(lit_code(current))
+            prev_concat = True
+            i += 1
+            continue
+
+        # 3) 左括号
+        if cls == _C_LPAREN:
+            if prev_concat:
+                push_concat()
+            op_stack.append(current)
+            prev_concat = False
+            i += 1
+            continue
+
+        # 4) 右括号
+        if cls == _C_RPAREN:
+            while op_stack and op_stack[-1] != "(":
+                out_append(_OPCODES[op_stack.pop()])
+            if op_stack and op_stack[-1] == "(":
+                op_stack.pop()
+            else:
+                raise ValueError(f"Unmatched parentheses in regex: {regex}")
+            prev_concat = True
+            i += 1
+            continue
+
+        # 5) 结束符 '#'（不更新 prev_concat，与旧实现一致）
+        if cls == _C_END:
+            while op_stack:
+                op = op_stack.pop()
+                if op == "(":
+                    raise ValueError("Unmatched parentheses in regex")
+                out_append(_OPCODES[op])
+            i += 1
+            continue
+
+        # 6) 运算符 | * ~
+        while op_stack and priority(op_stack[-1], 0) >= priority(current, 0) and op_stack[-1] != "(":
+            out_append(_OPCODES[op_stack.pop()])
+        op_stack.append(current)
+        prev_concat = cls == _C_STAR
+        i += 1
+
+    return output, literals
+
+
+# 片段不变式（拼接正确性的依据）：
+#   - 片段结束结点都是 ε 结点且没有出边；
+#   - 入度为 0 的 ε 起始结点可以直接追加分支而不引入多余路径
+def _can_splice_start(node: NFANode) -> bool:
+    return node.path_char is None and node.in_count == 0
+
+
+def _meet_non_symbol(next_id: Callable[[], int], ch: str) -> NFA:
+    start = NFANode(next_id())
+    end = NFANode(next_id())
+    start.add_transition(ch, end)
+    return NFA(start, end)
+
+
+def _meet_or(next_id: Callable[[], int], a: NFA, b: NFA) -> NFA:
+    # 结束端总能拼接：b.end 并入 a.end（两者都是无出边的 ε 结点）
+    b.end_node.add_epsilon_transition(a.end_node)
+
+    # 起始端：优先复用入度为 0 的 ε 起点，省掉包装结点和两条 ε 边
+    if _can_splice_start(a.start_node):
+        a.start_node.add_epsilon_transition(b.start_node)
+        return NFA(a.start_node, a.end_node)
+    if _can_splice_start(b.start_node):
+        b.start_node.add_epsilon_transition(a.start_node)
+        return NFA(b.start_node, a.end_node)
+
+    new_start = NFANode(next_id())
+    new_start.add_epsilon_transition(a.start_node)
+    new_start.add_epsilon_transition(b.start_node)
+    return NFA(new_start, a.end_node)
+
+
+def _meet_and(a: NFA, b: NFA) -> NFA:
+    a.end_node.add_epsilon_transition(b.start_node)
+    return NFA(a.start_node, b.end_node)
+
+
+def _meet_star(next_id: Callable[[], int], old: NFA) -> NFA:
+    new_end = NFANode(next_id())
+    if _can_splice_start(old.start_node):
+        # 复用原起点：跳过边 old.start->end，回环 old.end->old.start。
+        # 回环让起点入度 > 0，后续 _meet_or 不会再把它当可拼接起点
+        old.start_node.add_epsilon_transition(new_end)
+        old.end_node.add_epsilon_transition(old.start_node)
+        return NFA(old.start_node, new_end)
+
+    new_start = NFANode(next_id())
+    new_start.add_epsilon_transition(new_end)
+    new_start.add_epsilon_transition(old.start_node)
+    old.end_node.add_epsilon_transition(old.start_node)
+    old.end_node.add_epsilon_transition(new_end)
+    return NFA(new_start, new_end)
+
+
+# 构建完成后把所有可达结点的 next_nodes 冻结为 tuple：
+# 下游 ε 闭包/子集构造只读遍历，tuple 迭代更快也更省内存
+def _freeze(nfa: NFA) -> None:
+    stack = [nfa.start_node]
+    seen = {nfa.start_node.state_id}
+    while stack:
+        node = stack.pop()
+        node.next_nodes = tuple(node.next_nodes)
+        for next_node in node.next_nodes:
+            if next_node.state_id not in seen:
+                seen.add(next_node.state_id)
+                stack.append(next_node)
+
+
+def build_nfa(regex: str) -> NFA:
     """将简化正则（支持 |, *, (), 隐式连接）构建为 Thompson NFA。
 
     - 中缀转后缀时内部使用连接符 '~' 与结束符 '#'
     - 仅把 '|~*()' 视为运算符；其他字符都当作普通字符
     - 支持转义序列：\\n, \\t, \\r, \\0，以及默认转义（例如 \\| 表示字面量 '|')
+
+    纯函数：状态计数与两个工作栈都是调用局部的，重复调用互不影响。
     """
-    
-    # 每创建一个 NFANode 都会 +1
-    state_counter: int = 0
-    # NFA 栈，在 后缀 转 NFA 过程中使用
-    nfa_stack: Deque[NFA] = field(default_factory=deque)
-    # 运算符栈，在 中缀 转 后缀 过程中使用
-    op_stack: Deque[str] = field(default_factory=deque)
-
-    def _next_state_id(self) -> int:
-        self.state_counter += 1
-        return self.state_counter
-
-    # 判断是否为运算符
-    @staticmethod
-    def _is_operator(ch: str) -> bool:
-        return ch in "|~*()"
-    
-    # 运算符优先级
-    # *为闭包，~为连接，|为或（注意~是人为假设的）
-    @staticmethod
-    def _priority(op: str) -> int:
-        if op == "*":
-            return 3
-        if op == "~":
-            return 2
-        if op == "|":
-            return 1
-        return 0
-
-    @staticmethod
-    def _parse_escape_token(token: str) -> str:
-        # token 可能是 "\\n" 或 "a" 或 "\\|"
-        if len(token) > 1 and token.startswith("\\"):
-            esc = token[1]
-            if esc == "n":
-                return "\n"
-            if esc == "t":
-                return "\t"
-            if esc == "r":
-                return "\r"
-            if esc == "0":
-                return "\0"
-            return esc
-        return token[0]
-
-    # 中缀表达式转后缀表达式
-    def _infix_to_postfix(self, regex: str) -> List[str]:
-        processed = regex + "#"
-        output: List[str] = []
-        self.op_stack.clear()
-
-        i = 0
-        prev_char = "#"  # 记录上一个已处理 token 的类型，用来判断“当前 token 前面是否可以合法连接”，作为初始哨兵（sentinel），表示“还没有处理任何字符”，保证表达式开头不会错误地插入隐式连接符 ~
-
-        while i < len(processed):
-            current = processed[i]
-
-            # 1) 处理转义字符
-            if current == "\\":
-                if prev_char != "#" and (prev_char == ")" or (not self._is_operator(prev_char)) or prev_char == "*"):
-                    while self.op_stack and self._priority(self.op_stack[-1]) >= self._priority("~"):
-                        output.append(self.op_stack.pop())
-                    self.op_stack.append("~")
-
-                if i + 1 < len(processed):
-                    escape_seq = "\\" + processed[i + 1]
-                    output.append(escape_seq)
-                    prev_char = "a"  # 将转义序列视为普通字符
-                    i += 2
-                else:
-                    # 非法：以 \\ 结尾，当作普通 \\ 处理
-                    output.append("\\")
-                    prev_char = "\\"
-                    i += 1
-                continue
-
-            # 2) 普通字符
-            if current != "#" and not self._is_operator(current):
-                if prev_char != "#" and (prev_char == ")" or (not self._is_operator(prev_char)) or prev_char == "*"):
-                    while self.op_stack and self._priority(self.op_stack[-1]) >= self._priority("~"):
-                        output.append(self.op_stack.pop())
-                    self.op_stack.append("~")
-                output.append(current)
-                prev_char = current
-                i += 1
-                continue
-
-            # 3) 左括号
-            if current == "(":
-                if prev_char != "#" and (prev_char == ")" or (not self._is_operator(prev_char)) or prev_char == "*"):
-                    while self.op_stack and self._priority(self.op_stack[-1]) >= self._priority("~"):
-                        output.append(self.op_stack.pop())
-                    self.op_stack.append("~")
-                self.op_stack.append(current)
-                prev_char = current
-                i += 1
-                continue
-
-            # 4) 右括号
-            if current == ")":
-                while self.op_stack and self.op_stack[-1] != "(":
-                    output.append(self.op_stack.pop())
-                if self.op_stack and self.op_stack[-1] == "(":
-                    self.op_stack.pop()
-                else:
-                    raise ValueError(f"Unmatched parentheses in regex: {regex}")
-                prev_char = current
-                i += 1
-                continue
-
-            # 5) 结束符 '#'
-            if current == "#":
-                while self.op_stack:
-                    op = self.op_stack.pop()
-                    if op == "(":
-                        raise ValueError("Unmatched parentheses in regex")
-                    output.append(op)
-                i += 1
-                continue
+    if regex is None or regex == "":
+        raise ValueError("Regex cannot be null or empty")
 
-            # 6) 运算符 | *
-            while self.op_stack and self._priority(self.op_stack[-1]) >= self._priority(current) and self.op_stack[-1] != "(":
-                output.append(self.op_stack.pop())
-            self.op_stack.append(current)
-            prev_char = current
-            i += 1
+    cached = _NFA_CACHE.get(regex)
+    if cached is not None:
+        return cached
 
-        return output
-
-    def _meet_non_symbol(self, ch: str) -> NFA:
-        start = NFANode(self._next_state_id())
-        end = NFANode(self._next_state_id())
-        start.add_transition(ch, end)
-        return NFA(start, end)
-
-    def _meet_or(self, a: NFA, b: NFA) -> NFA:
-        new_start = NFANode(self._next_state_id())
-        new_end = NFANode(self._next_state_id())
-        new_start.add_epsilon_transition(a.start_node)
-        new_start.add_epsilon_transition(b.start_node)
-        a.end_node.add_epsilon_transition(new_end)
-        b.end_node.add_epsilon_transition(new_end)
-        return NFA(new_start, new_end)
-
-    @staticmethod
-    def _meet_and(a: NFA, b: NFA) -> NFA:
-        a.end_node.add_epsilon_transition(b.start_node)
-        return NFA(a.start_node, b.end_node)
-
-    def _meet_star(self, old: NFA) -> NFA:
-        new_start = NFANode(self._next_state_id())
-        new_end = NFANode(self._next_state_id())
-        new_start.add_epsilon_transition(new_end)
-        new_start.add_epsilon_transition(old.start_node)
-        old.end_node.add_epsilon_transition(old.start_node)
-        old.end_node.add_epsilon_transition(new_end)
-        return NFA(new_start, new_end)
+    postfix, literals = _infix_to_postfix(regex)
+    nfa_stack: List[NFA] = []
+    next_id = count(1).__next__
 
-    def build_nfa(self, regex: str) -> NFA:
-        if regex is None or regex == "":
-            raise ValueError("Regex cannot be null or empty")
-
-        postfix = self._infix_to_postfix(regex)
-        self.nfa_stack.clear()
-        self.state_counter = 0
-
-        for token in postfix:
-            # token 可能是运算符，也可能是 "\\+" 这种转义 token
-            if (not self._is_operator(token[0])) or token.startswith("\\"):
-                ch = self._parse_escape_token(token)
-                self.nfa_stack.append(self._meet_non_symbol(ch))
-                continue
-
-            op = token[0]
-            if op == "|":
-                if len(self.nfa_stack) < 2:
-                    raise ValueError("Invalid regex: missing operands for |")
-                b = self.nfa_stack.pop()
-                a = self.nfa_stack.pop()
-                self.nfa_stack.append(self._meet_or(a, b))
-            elif op == "~":
-                if len(self.nfa_stack) < 2:
-                    raise ValueError("Invalid regex: missing operands for concatenation")
-                b = self.nfa_stack.pop()
-                a = self.nfa_stack.pop()
-                self.nfa_stack.append(self._meet_and(a, b))
-            elif op == "*":
-                if not self.nfa_stack:
-                    raise ValueError("Invalid regex: missing operand for *")
-                old = self.nfa_stack.pop()
-                self.nfa_stack.append(self._meet_star(old))
-            else:
-                raise ValueError(f"Unsupported operator: {op}")
+    for code in postfix:
+        # >= _OP_BASE 的字节是字面量表下标，其余是运算符操作码
+        if code >= _OP_BASE:
+            nfa_stack.append(_meet_non_symbol(next_id, literals[code - _OP_BASE]))
+            continue
 
-        if len(self.nfa_stack) != 1:
-            raise ValueError(f"Invalid regex expression: {regex}")
+        if code == _OP_PIPE:
+            if len(nfa_stack) < 2:
+                raise ValueError("Invalid regex: missing operands for |")
+            b = nfa_stack.pop()
+            a = nfa_stack.pop()
+            nfa_stack.append(_meet_or(next_id, a, b))
+        elif code == _OP_CONCAT:
+            if len(nfa_stack) < 2:
+                raise ValueError("Invalid regex: missing operands for concatenation")
+            b = nfa_stack.pop()
+            a = nfa_stack.pop()
+            nfa_stack.append(_meet_and(a, b))
+        else:  # _OP_STAR
+            if not nfa_stack:
+                raise ValueError("Invalid regex: missing operand for *")
+            old = nfa_stack.pop()
+            nfa_stack.append(_meet_star(next_id, old))
+
+    if len(nfa_stack) != 1:
+        raise ValueError(f"Invalid regex expression: {regex}")
+
+    nfa = nfa_stack.pop()
+    _freeze(nfa)
+    _NFA_CACHE[regex] = nfa
+    return nfa
+
+
+class NFABuilder:
+    """模块级纯函数 build_nfa 的薄包装，保持既有调用方式不变。"""
+
+    def build_nfa(self, regex: str) -> NFA:
+        return build_nfa(regex)
 
-        return self.nfa_stack.pop()
 
 if __name__ == "__main__":
-    builder = NFABuilder()
     regex = "a(b|c)*d"
-    postfix = builder._infix_to_postfix(regex)
+    postfix, literals = _infix_to_postfix(regex)
+    decoded = [literals[code - _OP_BASE] if code >= _OP_BASE else "|~*"[code] for code in postfix]
     print("中缀表达式:", regex)
-    print("后缀表达式:", postfix)
-    nfa = builder.build_nfa(regex)
-    nfa.visualize()
\ No newline at end of file
+    print("后缀表达式:", decoded)
+    nfa = build_nfa(regex)
+    nfa.visualize()
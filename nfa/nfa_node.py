@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Optional, List
+from typing import Optional, Sequence
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class NFANode:
     """NFA 结点。
 
@@ -18,8 +18,10 @@ class NFANode:
     state_id: int
     # 转移字符，None 表示 ε 转移
     path_char: Optional[str] = None
-    # 下一个结点列表
-    next_nodes: List[NFANode] = field(default_factory=list)
+    # 下一个结点列表：构建期间是 list，build_nfa 结束后被冻结为 tuple
+    next_nodes: Sequence[NFANode] = field(default_factory=list)
+    # 入边计数：NFABuilder 据此判断结点能否被复用拼接
+    in_count: int = field(default=0, repr=False)
 
     # 添加字符转移
     def add_transition(self, character: str, target_node: NFANode) -> None:
@@ -27,10 +29,12 @@ class NFANode:
             raise ValueError("character must be a single character")
         self.path_char = character
         self.next_nodes.append(target_node)
+        target_node.in_count += 1
 
     # 添加 ε 转移
     def add_epsilon_transition(self, target_node: NFANode) -> None:
         self.next_nodes.append(target_node)
+        target_node.in_count += 1
 
     def __str__(self) -> str:
         next_ids = [str(node.state_id) for node in self.next_nodes]
@@ -0,0 +1,295 @@
+"""默认 LL(1) 文法的预计算集合与预测表。
+
+生成文件，勿手改；重新生成：python -m parser.ll1_sets
+"""
+
+FIRST = {
+    'AddExpr': frozenset({'!', '(', '+', '-', 'IDENT', 'NUM'}),
+    'AddOp': frozenset({'+', '-'}),
+    'AddTail': frozenset({'+', '-', 'ε'}),
+    'AssignOp': frozenset({'*=', '+=', '-=', '/=', '='}),
+    'Block': frozenset({'{'}),
+    'DeclInitOpt': frozenset({'=', 'ε'}),
+    'DeclStmt': frozenset({'char', 'double', 'float', 'int'}),
+    'Expr': frozenset({'!', '(', '+', '-', 'IDENT', 'NUM'}),
+    'ForCondOpt': frozenset({'!', '(', '+', '-', 'IDENT', 'NUM', 'ε'}),
+    'ForIdTail': frozenset({'*=', '++', '+=', '--', '-=', '/=', '='}),
+    'ForInitOpt': frozenset({'++', '--', 'IDENT', 'char', 'double', 'float', 'int', 'ε'}),
+    'ForIterOpt': frozenset({'++', '--', 'IDENT', 'ε'}),
+    'ForStmt': frozenset({'for'}),
+    'IdStmtTail': frozenset({'*=', '++', '+=', '--', '-=', '/=', '='}),
+    'IncDecOp': frozenset({'++', '--'}),
+    'MulExpr': frozenset({'!', '(', '+', '-', 'IDENT', 'NUM'}),
+    'MulOp': frozenset({'*', '/'}),
+    'MulTail': frozenset({'*', '/', 'ε'}),
+    'PrefixIncDec': frozenset({'++', '--'}),
+    'Primary': frozenset({'(', 'IDENT', 'NUM'}),
+    'Program': frozenset({'++', '--', ';', 'EOF', 'IDENT', 'char', 'double', 'float', 'for', 'int', '{'}),
+    'RelOp': frozenset({'!=', '<', '<=', '==', '>', '>='}),
+    'RelTail': frozenset({'!=', '<', '<=', '==', '>', '>=', 'ε'}),
+    'Stmt': frozenset({'++', '--', ';', 'IDENT', 'char', 'double', 'float', 'for', 'int', '{'}),
+    'StmtList': frozenset({'++', '--', ';', 'IDENT', 'char', 'double', 'float', 'for', 'int', '{', 'ε'}),
+    'Type': frozenset({'char', 'double', 'float', 'int'}),
+    'Unary': frozenset({'!', '(', '+', '-', 'IDENT', 'NUM'}),
+    'UnaryOp': frozenset({'!', '+', '-'}),
+}
+
+FOLLOW = {
+    'AddExpr': frozenset({'!=', ')', ';', '<', '<=', '==', '>', '>='}),
+    'AddOp': frozenset({'!', '(', '+', '-', 'IDENT', 'NUM'}),
+    'AddTail': frozenset({'!=', ')', ';', '<', '<=', '==', '>', '>='}),
+    'AssignOp': frozenset({'!', '(', '+', '-', 'IDENT', 'NUM'}),
+    'Block': frozenset({'++', '--', ';', 'EOF', 'IDENT', 'char', 'double', 'float', 'for', 'int', '{', '}'}),
+    'DeclInitOpt': frozenset({';'}),
+    'DeclStmt': frozenset({';'}),
+    'Expr': frozenset({')', ';'}),
+    'ForCondOpt': frozenset({';'}),
+    'ForIdTail': frozenset({')', ';'}),
+    'ForInitOpt': frozenset({';'}),
+    'ForIterOpt': frozenset({')'}),
+    'ForStmt': frozenset({'++', '--', ';', 'EOF', 'IDENT', 'char', 'double', 'float', 'for', 'int', '{', '}'}),
+    'IdStmtTail': frozenset({';'}),
+    'IncDecOp': frozenset({')', ';', 'IDENT'}),
+    'MulExpr': frozenset({'!=', ')', '+', '-', ';', '<', '<=', '==', '>', '>='}),
+    'MulOp': frozenset({'!', '(', '+', '-', 'IDENT', 'NUM'}),
+    'MulTail': frozenset({'!=', ')', '+', '-', ';', '<', '<=', '==', '>', '>='}),
+    'PrefixIncDec': frozenset({')', ';'}),
+    'Primary': frozenset({'!=', ')', '*', '+', '-', '/', ';', '<', '<=', '==', '>', '>='}),
+    'Program': frozenset({'EOF'}),
+    'RelOp': frozenset({'!', '(', '+', '-', 'IDENT', 'NUM'}),
+    'RelTail': frozenset({')', ';'}),
+    'Stmt': frozenset({'++', '--', ';', 'EOF', 'IDENT', 'char', 'double', 'float', 'for', 'int', '{', '}'}),
+    'StmtList': frozenset({'EOF', '}'}),
+    'Type': frozenset({'IDENT'}),
+    'Unary': frozenset({'!=', ')', '*', '+', '-', '/', ';', '<', '<=', '==', '>', '>='}),
+    'UnaryOp': frozenset({'!', '(', '+', '-', 'IDENT', 'NUM'}),
+}
+
+SELECT = {
+    ('AddExpr', ('MulExpr', 'AddTail')): frozenset({'!', '(', '+', '-', 'IDENT', 'NUM'}),
+    ('AddOp', ('+',)): frozenset({'+'}),
+    ('AddOp', ('-',)): frozenset({'-'}),
+    ('AddTail', ()): frozenset({'!=', ')', ';', '<', '<=', '==', '>', '>='}),
+    ('AddTail', ('AddOp', 'MulExpr', 'AddTail')): frozenset({'+', '-'}),
+    ('AssignOp', ('*=',)): frozenset({'*='}),
+    ('AssignOp', ('+=',)): frozenset({'+='}),
+    ('AssignOp', ('-=',)): frozenset({'-='}),
+    ('AssignOp', ('/=',)): frozenset({'/='}),
+    ('AssignOp', ('=',)): frozenset({'='}),
+    ('Block', ('{', 'StmtList', '}')): frozenset({'{'}),
+    ('DeclInitOpt', ()): frozenset({';'}),
+    ('DeclInitOpt', ('=', 'Expr')): frozenset({'='}),
+    ('DeclStmt', ('Type', 'IDENT', 'DeclInitOpt')): frozenset({'char', 'double', 'float', 'int'}),
+    ('Expr', ('AddExpr', 'RelTail')): frozenset({'!', '(', '+', '-', 'IDENT', 'NUM'}),
+    ('ForCondOpt', ()): frozenset({';'}),
+    ('ForCondOpt', ('Expr',)): frozenset({'!', '(', '+', '-', 'IDENT', 'NUM'}),
+    ('ForIdTail', ('AssignOp', 'Expr')): frozenset({'*=', '+=', '-=', '/=', '='}),
+    ('ForIdTail', ('IncDecOp',)): frozenset({'++', '--'}),
+    ('ForInitOpt', ()): frozenset({';'}),
+    ('ForInitOpt', ('DeclStmt',)): frozenset({'char', 'double', 'float', 'int'}),
+    ('ForInitOpt', ('IDENT', 'ForIdTail')): frozenset({'IDENT'}),
+    ('ForInitOpt', ('PrefixIncDec',)): frozenset({'++', '--'}),
+    ('ForIterOpt', ()): frozenset({')'}),
+    ('ForIterOpt', ('IDENT', 'ForIdTail')): frozenset({'IDENT'}),
+    ('ForIterOpt', ('PrefixIncDec',)): frozenset({'++', '--'}),
+    ('ForStmt', ('for', '(', 'ForInitOpt', ';', 'ForCondOpt', ';', 'ForIterOpt', ')', 'Stmt')): frozenset({'for'}),
+    ('IdStmtTail', ('AssignOp', 'Expr')): frozenset({'*=', '+=', '-=', '/=', '='}),
+    ('IdStmtTail', ('IncDecOp',)): frozenset({'++', '--'}),
+    ('IncDecOp', ('++',)): frozenset({'++'}),
+    ('IncDecOp', ('--',)): frozenset({'--'}),
+    ('MulExpr', ('Unary', 'MulTail')): frozenset({'!', '(', '+', '-', 'IDENT', 'NUM'}),
+    ('MulOp', ('*',)): frozenset({'*'}),
+    ('MulOp', ('/',)): frozenset({'/'}),
+    ('MulTail', ()): frozenset({'!=', ')', '+', '-', ';', '<', '<=', '==', '>', '>='}),
+    ('MulTail', ('MulOp', 'Unary', 'MulTail')): frozenset({'*', '/'}),
+    ('PrefixIncDec', ('IncDecOp', 'IDENT')): frozenset({'++', '--'}),
+    ('Primary', ('(', 'Expr', ')')): frozenset({'('}),
+    ('Primary', ('IDENT',)): frozenset({'IDENT'}),
+    ('Primary', ('NUM',)): frozenset({'NUM'}),
+    ('Program', ('StmtList', 'EOF')): frozenset({'++', '--', ';', 'EOF', 'IDENT', 'char', 'double', 'float', 'for', 'int', '{'}),
+    ('RelOp', ('!=',)): frozenset({'!='}),
+    ('RelOp', ('<',)): frozenset({'<'}),
+    ('RelOp', ('<=',)): frozenset({'<='}),
+    ('RelOp', ('==',)): frozenset({'=='}),
+    ('RelOp', ('>',)): frozenset({'>'}),
+    ('RelOp', ('>=',)): frozenset({'>='}),
+    ('RelTail', ()): frozenset({')', ';'}),
+    ('RelTail', ('RelOp', 'AddExpr', 'RelTail')): frozenset({'!=', '<', '<=', '==', '>', '>='}),
+    ('Stmt', (';',)): frozenset({';'}),
+    ('Stmt', ('Block',)): frozenset({'{'}),
+    ('Stmt', ('DeclStmt', ';')): frozenset({'char', 'double', 'float', 'int'}),
+    ('Stmt', ('ForStmt',)): frozenset({'for'}),
+    ('Stmt', ('IDENT', 'IdStmtTail', ';')): frozenset({'IDENT'}),
+    ('Stmt', ('PrefixIncDec', ';')): frozenset({'++', '--'}),
+    ('StmtList', ()): frozenset({'EOF', '}'}),
+    ('StmtList', ('Stmt', 'StmtList')): frozenset({'++', '--', ';', 'IDENT', 'char', 'double', 'float', 'for', 'int', '{'}),
+    ('Type', ('char',)): frozenset({'char'}),
+    ('Type', ('double',)): frozenset({'double'}),
+    ('Type', ('float',)): frozenset({'float'}),
+    ('Type', ('int',)): frozenset({'int'}),
+    ('Unary', ('Primary',)): frozenset({'(', 'IDENT', 'NUM'}),
+    ('Unary', ('UnaryOp', 'Unary')): frozenset({'!', '+', '-'}),
+    ('UnaryOp', ('!',)): frozenset({'!'}),
+    ('UnaryOp', ('+',)): frozenset({'+'}),
+    ('UnaryOp', ('-',)): frozenset({'-'}),
+}
+
+PREDICT = {
+    ('AddExpr', '!'): ('MulExpr', 'AddTail'),
+    ('AddExpr', '('): ('MulExpr', 'AddTail'),
+    ('AddExpr', '+'): ('MulExpr', 'AddTail'),
+    ('AddExpr', '-'): ('MulExpr', 'AddTail'),
+    ('AddExpr', 'IDENT'): ('MulExpr', 'AddTail'),
+    ('AddExpr', 'NUM'): ('MulExpr', 'AddTail'),
+    ('AddOp', '+'): ('+',),
+    ('AddOp', '-'): ('-',),
+    ('AddTail', '!='): (),
+    ('AddTail', ')'): (),
+    ('AddTail', '+'): ('AddOp', 'MulExpr', 'AddTail'),
+    ('AddTail', '-'): ('AddOp', 'MulExpr', 'AddTail'),
+    ('AddTail', ';'): (),
+    ('AddTail', '<'): (),
+    ('AddTail', '<='): (),
+    ('AddTail', '=='): (),
+    ('AddTail', '>'): (),
+    ('AddTail', '>='): (),
+    ('AssignOp', '*='): ('*=',),
+    ('AssignOp', '+='): ('+=',),
+    ('AssignOp', '-='): ('-=',),
+    ('AssignOp', '/='): ('/=',),
+    ('AssignOp', '='): ('=',),
+    ('Block', '{'): ('{', 'StmtList', '}'),
+    ('DeclInitOpt', ';'): (),
+    ('DeclInitOpt', '='): ('=', 'Expr'),
+    ('DeclStmt', 'char'): ('Type', 'IDENT', 'DeclInitOpt'),
+    ('DeclStmt', 'double'): ('Type', 'IDENT', 'DeclInitOpt'),
+    ('DeclStmt', 'float'): ('Type', 'IDENT', 'DeclInitOpt'),
+    ('DeclStmt', 'int'): ('Type', 'IDENT', 'DeclInitOpt'),
+    ('Expr', '!'): ('AddExpr', 'RelTail'),
+    ('Expr', '('): ('AddExpr', 'RelTail'),
+    ('Expr', '+'): ('AddExpr', 'RelTail'),
+    ('Expr', '-'): ('AddExpr', 'RelTail'),
+    ('Expr', 'IDENT'): ('AddExpr', 'RelTail'),
+    ('Expr', 'NUM'): ('AddExpr', 'RelTail'),
+    ('ForCondOpt', '!'): ('Expr',),
+    ('ForCondOpt', '('): ('Expr',),
+    ('ForCondOpt', '+'): ('Expr',),
+    ('ForCondOpt', '-'): ('Expr',),
+    ('ForCondOpt', ';'): (),
+    ('ForCondOpt', 'IDENT'): ('Expr',),
+    ('ForCondOpt', 'NUM'): ('Expr',),
+    ('ForIdTail', '*='): ('AssignOp', 'Expr'),
+    ('ForIdTail', '++'): ('IncDecOp',),
+    ('ForIdTail', '+='): ('AssignOp', 'Expr'),
+    ('ForIdTail', '--'): ('IncDecOp',),
+    ('ForIdTail', '-='): ('AssignOp', 'Expr'),
+    ('ForIdTail', '/='): ('AssignOp', 'Expr'),
+    ('ForIdTail', '='): ('AssignOp', 'Expr'),
+    ('ForInitOpt', '++'): ('PrefixIncDec',),
+    ('ForInitOpt', '--'): ('PrefixIncDec',),
+    ('ForInitOpt', ';'): (),
+    ('ForInitOpt', 'IDENT'): ('IDENT', 'ForIdTail'),
+    ('ForInitOpt', 'char'): ('DeclStmt',),
+    ('ForInitOpt', 'double'): ('DeclStmt',),
+    ('ForInitOpt', 'float'): ('DeclStmt',),
+    ('ForInitOpt', 'int'): ('DeclStmt',),
+    ('ForIterOpt', ')'): (),
+    ('ForIterOpt', '++'): ('PrefixIncDec',),
+    ('ForIterOpt', '--'): ('PrefixIncDec',),
+    ('ForIterOpt', 'IDENT'): ('IDENT', 'ForIdTail'),
+    ('ForStmt', 'for'): ('for', '(', 'ForInitOpt', ';', 'ForCondOpt', ';', 'ForIterOpt', ')', 'Stmt'),
+    ('IdStmtTail', '*='): ('AssignOp', 'Expr'),
+    ('IdStmtTail', '++'): ('IncDecOp',),
+    ('IdStmtTail', '+='): ('AssignOp', 'Expr'),
+    ('IdStmtTail', '--'): ('IncDecOp',),
+    ('IdStmtTail', '-='): ('AssignOp', 'Expr'),
+    ('IdStmtTail', '/='): ('AssignOp', 'Expr'),
+    ('IdStmtTail', '='): ('AssignOp', 'Expr'),
+    ('IncDecOp', '++'): ('++',),
+    ('IncDecOp', '--'): ('--',),
+    ('MulExpr', '!'): ('Unary', 'MulTail'),
+    ('MulExpr', '('): ('Unary', 'MulTail'),
+    ('MulExpr', '+'): ('Unary', 'MulTail'),
+    ('MulExpr', '-'): ('Unary', 'MulTail'),
+    ('MulExpr', 'IDENT'): ('Unary', 'MulTail'),
+    ('MulExpr', 'NUM'): ('Unary', 'MulTail'),
+    ('MulOp', '*'): ('*',),
+    ('MulOp', '/'): ('/',),
+    ('MulTail', '!='): (),
+    ('MulTail', ')'): (),
+    ('MulTail', '*'): ('MulOp', 'Unary', 'MulTail'),
+    ('MulTail', '+'): (),
+    ('MulTail', '-'): (),
+    ('MulTail', '/'): ('MulOp', 'Unary', 'MulTail'),
+    ('MulTail', ';'): (),
+    ('MulTail', '<'): (),
+    ('MulTail', '<='): (),
+    ('MulTail', '=='): (),
+    ('MulTail', '>'): (),
+    ('MulTail', '>='): (),
+    ('PrefixIncDec', '++'): ('IncDecOp', 'IDENT'),
+    ('PrefixIncDec', '--'): ('IncDecOp', 'IDENT'),
+    ('Primary', '('): ('(', 'Expr', ')'),
+    ('Primary', 'IDENT'): ('IDENT',),
+    ('Primary', 'NUM'): ('NUM',),
+    ('Program', '++'): ('StmtList', 'EOF'),
+    ('Program', '--'): ('StmtList', 'EOF'),
+    ('Program', ';'): ('StmtList', 'EOF'),
+    ('Program', 'EOF'): ('StmtList', 'EOF'),
+    ('Program', 'IDENT'): ('StmtList', 'EOF'),
+    ('Program', 'char'): ('StmtList', 'EOF'),
+    ('Program', 'double'): ('StmtList', 'EOF'),
+    ('Program', 'float'): ('StmtList', 'EOF'),
+    ('Program', 'for'): ('StmtList', 'EOF'),
+    ('Program', 'int'): ('StmtList', 'EOF'),
+    ('Program', '{'): ('StmtList', 'EOF'),
+    ('RelOp', '!='): ('!=',),
+    ('RelOp', '<'): ('<',),
+    ('RelOp', '<='): ('<=',),
+    ('RelOp', '=='): ('==',),
+    ('RelOp', '>'): ('>',),
+    ('RelOp', '>='): ('>=',),
+    ('RelTail', '!='): ('RelOp', 'AddExpr', 'RelTail'),
+    ('RelTail', ')'): (),
+    ('RelTail', ';'): (),
+    ('RelTail', '<'): ('RelOp', 'AddExpr', 'RelTail'),
+    ('RelTail', '<='): ('RelOp', 'AddExpr', 'RelTail'),
+    ('RelTail', '=='): ('RelOp', 'AddExpr', 'RelTail'),
+    ('RelTail', '>'): ('RelOp', 'AddExpr', 'RelTail'),
+    ('RelTail', '>='): ('RelOp', 'AddExpr', 'RelTail'),
+    ('Stmt', '++'): ('PrefixIncDec', ';'),
+    ('Stmt', '--'): ('PrefixIncDec', ';'),
+    ('Stmt', ';'): (';',),
+    ('Stmt', 'IDENT'): ('IDENT', 'IdStmtTail', ';'),
+    ('Stmt', 'char'): ('DeclStmt', ';'),
+    ('Stmt', 'double'): ('DeclStmt', ';'),
+    ('Stmt', 'float'): ('DeclStmt', ';'),
+    ('Stmt', 'for'): ('ForStmt',),
+    ('Stmt', 'int'): ('DeclStmt', ';'),
+    ('Stmt', '{'): ('Block',),
+    ('StmtList', '++'): ('Stmt', 'StmtList'),
+    ('StmtList', '--'): ('Stmt', 'StmtList'),
+    ('StmtList', ';'): ('Stmt', 'StmtList'),
+    ('StmtList', 'EOF'): (),
+    ('StmtList', 'IDENT'): ('Stmt', 'StmtList'),
+    ('StmtList', 'char'): ('Stmt', 'StmtList'),
+    ('StmtList', 'double'): ('Stmt', 'StmtList'),
+    ('StmtList', 'float'): ('Stmt', 'StmtList'),
+    ('StmtList', 'for'): ('Stmt', 'StmtList'),
+    ('StmtList', 'int'): ('Stmt', 'StmtList'),
+    ('StmtList', '{'): ('Stmt', 'StmtList'),
+    ('StmtList', '}'): (),
+    ('Type', 'char'): ('char',),
+    ('Type', 'double'): ('double',),
+    ('Type', 'float'): ('float',),
+    ('Type', 'int'): ('int',),
+    ('Unary', '!'): ('UnaryOp', 'Unary'),
+    ('Unary', '('): ('Primary',),
+    ('Unary', '+'): ('UnaryOp', 'Unary'),
+    ('Unary', '-'): ('UnaryOp', 'Unary'),
+    ('Unary', 'IDENT'): ('Primary',),
+    ('Unary', 'NUM'): ('Primary',),
+    ('UnaryOp', '!'): ('!',),
+    ('UnaryOp', '+'): ('+',),
+    ('UnaryOp', '-'): ('-',),
+}
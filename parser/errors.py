@@ -14,10 +14,15 @@ class ParseError(Exception):
     # 期望得到的符号列表
     expected: Optional[Iterable[str]] = None
 
+    def __post_init__(self) -> None:
+        # 去重排序只做一次，__str__ 反复调用（日志/报告）时直接 join
+        if self.expected is not None:
+            self.expected = tuple(sorted(set(self.expected)))
+
     def __str__(self) -> str:
         exp = ""
         if self.expected:
-            exp = f"，期望: {', '.join(sorted(set(self.expected)))}"
+            exp = f"，期望: {', '.join(self.expected)}"
         return f"语法错误 @ 行{self.line},列{self.column}: {self.message}（得到: {self.got}{exp}）"
 
 
@@ -1,18 +1,26 @@
 from __future__ import annotations
 
+import sys
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, FrozenSet, List, Mapping, Sequence, Set, Tuple
+from pathlib import Path
+from typing import Deque, Dict, FrozenSet, List, Mapping, Optional, Sequence, Set, Tuple
 
 
 Symbol = str
 RHS = Tuple[Symbol, ...]
 
+# ε 标记：只在内部位集编码和报告格式化时出现
+_EPS = "ε"
+
 
 @dataclass(frozen=True)
 class LL1Sets:
     first: Mapping[Symbol, FrozenSet[Symbol]]
     follow: Mapping[Symbol, FrozenSet[Symbol]]
     select: Mapping[Tuple[Symbol, RHS], FrozenSet[Symbol]]
+    # 预测分析表：(非终结符, 展望符) -> rhs，单次 dict 查找即可选产生式
+    predict: Mapping[Tuple[Symbol, Symbol], RHS]
 
 
 class LL1Grammar:
@@ -26,181 +34,332 @@ class LL1Grammar:
 
     def __init__(self, start_symbol: Symbol, productions: Mapping[Symbol, Sequence[Sequence[Symbol]]]):
         self.start_symbol = start_symbol
-        self.productions: Dict[Symbol, List[RHS]] = {
-            lhs: [tuple(rhs) for rhs in rhss] for lhs, rhss in productions.items()
+        # 产生式全部冻结为 tuple：无处修改，不可变结构迭代/哈希都更便宜。
+        # 相同 rhs 驻留为同一对象、符号经 sys.intern，(lhs, rhs) 键的
+        # 哈希与相等比较在下游（SELECT/备忘录）都更快
+        intern_rhs: Dict[RHS, RHS] = {}
+
+        def interned(rhs: Sequence[Symbol]) -> RHS:
+            t = tuple(sys.intern(sym) for sym in rhs)
+            return intern_rhs.setdefault(t, t)
+
+        self.productions: Dict[Symbol, Tuple[RHS, ...]] = {
+            sys.intern(lhs): tuple(interned(rhs) for rhs in rhss) for lhs, rhss in productions.items()
         }
 
         self.nonterminals: FrozenSet[Symbol] = frozenset(self.productions.keys())
 
+        # 摊平的 (lhs, rhs) 列表：整轮遍历产生式时省掉嵌套 dict/list 迭代
+        self._prod_list: List[Tuple[Symbol, RHS]] = [
+            (lhs, rhs) for lhs, rhss in self.productions.items() for rhs in rhss
+        ]
+
+        # 非终结符整数编号：不动点内部用 list 按下标存取，免去字符串哈希
+        self._nts_by_id: List[Symbol] = list(self.productions)
+        self._nt_ids: Dict[Symbol, int] = {nt: i for i, nt in enumerate(self._nts_by_id)}
+
+        # 终结符/EOF/ε 的位编号：FIRST/FOLLOW 内部用整数位集表示，
+        # 并、减、判变化都是单次整数运算，出口处再转回 frozenset
+        self._symbol_bits: Dict[Symbol, int] = {}
+        for _, rhs in self._prod_list:
+            for sym in rhs:
+                if sym not in self.nonterminals and sym not in self._symbol_bits:
+                    self._symbol_bits[sym] = 1 << len(self._symbol_bits)
+        for sym in ("EOF", _EPS):
+            if sym not in self._symbol_bits:
+                self._symbol_bits[sym] = 1 << len(self._symbol_bits)
+        self._symbols_by_bit: List[Symbol] = list(self._symbol_bits)
+        self._eps_bit: int = self._symbol_bits[_EPS]
+
+        # _first_of_sequence 的备忘录：FOLLOW/SELECT 阶段对同一 rhs 后缀
+        # 反复求 FIRST，而此时 first 已收敛，结果可以按后缀缓存
+        self._first_seq_cache: Dict[RHS, Tuple[int, bool]] = {}
+
+    def _mask_to_frozenset(self, mask: int) -> FrozenSet[Symbol]:
+        symbols = self._symbols_by_bit
+        out: List[Symbol] = []
+        i = 0
+        while mask:
+            if mask & 1:
+                out.append(symbols[i])
+            mask >>= 1
+            i += 1
+        return frozenset(out)
+
     # 判断符号是否为非终结符
     def is_nonterminal(self, sym: Symbol) -> bool:
         return sym in self.nonterminals
 
     def terminals(self) -> FrozenSet[Symbol]:
         ts: Set[Symbol] = set()
-        for lhs, rhss in self.productions.items():
-            for rhs in rhss:
-                for sym in rhs:
-                    if not self.is_nonterminal(sym):
-                        ts.add(sym)
+        for _, rhs in self._prod_list:
+            for sym in rhs:
+                if not self.is_nonterminal(sym):
+                    ts.add(sym)
         # 终结符
         return frozenset(ts)
 
     def compute_first_follow_select(self) -> LL1Sets:
         first = self._compute_first()
+        # first 自此不再变化，后缀缓存在 FOLLOW 与 SELECT 之间共享
+        self._first_seq_cache.clear()
         follow = self._compute_follow(first)
         select = self._compute_select(first, follow)
-        return LL1Sets(first=first, follow=follow, select=select)
-
-    def _compute_first(self) -> Dict[Symbol, FrozenSet[Symbol]]:
-        # FIRST(sym) 只包含终结符；ε 通过 empty rhs 推导时，用特殊标记内部处理。
-        EPS = "ε"
-
-        first: Dict[Symbol, Set[Symbol]] = {nt: set() for nt in self.nonterminals}
-
-        changed = True
-        while changed:
-            changed = False
-            for lhs, rhss in self.productions.items():
-                for rhs in rhss:
-                    if len(rhs) == 0:
-                        if EPS not in first[lhs]:
-                            first[lhs].add(EPS)
-                            changed = True
-                        continue
-
-                    # FIRST(rhs1 rhs2 ...)
-                    all_can_eps = True
-                    for sym in rhs:
-                        if self.is_nonterminal(sym):
-                            sym_first = first[sym]
-                            add_set = {t for t in sym_first if t != EPS}
-                            if not add_set.issubset(first[lhs]):
-                                first[lhs].update(add_set)
-                                changed = True
-                            if EPS in sym_first:
-                                # 继续看下一个
-                                pass
-                            else:
-                                all_can_eps = False
-                                break
-                        else:
-                            # 终结符
-                            if sym not in first[lhs]:
-                                first[lhs].add(sym)
-                                changed = True
+        to_set = self._mask_to_frozenset
+
+        # SELECT 倒排成预测分析表；重复的 (lhs, 展望符) 即 LL(1) 冲突
+        predict: Dict[Tuple[Symbol, Symbol], RHS] = {}
+        for (lhs, rhs), mask in select.items():
+            for la in to_set(mask):
+                key = (lhs, la)
+                if key in predict:
+                    raise ValueError(f"LL(1) conflict at {key}: {predict[key]} vs {rhs}")
+                predict[key] = rhs
+
+        return LL1Sets(
+            first={nt: to_set(mask) for nt, mask in first.items()},
+            follow={nt: to_set(mask) for nt, mask in follow.items()},
+            select={key: to_set(mask) for key, mask in select.items()},
+            predict=predict,
+        )
+
+    def _build_first_deps(self) -> List[List[int]]:
+        """nt 编号 -> 引用它的 lhs 编号列表：FIRST 变化时只需重算这些 lhs。
+
+        一个 rhs 里只有首个终结符之前的符号会影响 FIRST(lhs)；
+        非终结符是否可空此时未知，保守地为整段非终结符前缀建边。
+        """
+        nt_ids = self._nt_ids
+        deps: List[Set[int]] = [set() for _ in self._nts_by_id]
+        for lhs, rhs in self._prod_list:
+            lhs_id = nt_ids[lhs]
+            for sym in rhs:
+                if sym not in self.nonterminals:
+                    break
+                deps[nt_ids[sym]].add(lhs_id)
+        return [list(s) for s in deps]
+
+    def _compute_first(self) -> Dict[Symbol, int]:
+        # FIRST(sym) 只包含终结符；ε 通过 empty rhs 推导时，用 ε 位内部处理。
+        eps_bit = self._eps_bit
+        bits = self._symbol_bits
+        nts = self.nonterminals
+        nt_ids = self._nt_ids
+        nts_by_id = self._nts_by_id
+        prods_by_id: List[Tuple[RHS, ...]] = [self.productions[nt] for nt in nts_by_id]
+
+        first: List[int] = [0] * len(nts_by_id)
+        deps = self._build_first_deps()
+
+        # 工作表驱动的不动点：只有依赖的 FIRST 真的变了才重算对应 lhs，
+        # 不再整轮扫描全部产生式；pending 标志位代替集合成员测试
+        worklist: Deque[int] = deque(range(len(nts_by_id)))
+        pending = bytearray([1]) * len(nts_by_id)
+        while worklist:
+            lhs_id = worklist.popleft()
+            pending[lhs_id] = 0
+
+            target = first[lhs_id]
+            before = target
+            for rhs in prods_by_id[lhs_id]:
+                if len(rhs) == 0:
+                    target |= eps_bit
+                    continue
+
+                # FIRST(rhs1 rhs2 ...)
+                all_can_eps = True
+                for sym in rhs:
+                    if sym in nts:
+                        sym_first = first[nt_ids[sym]]
+                        target |= sym_first & ~eps_bit
+                        if not sym_first & eps_bit:
                             all_can_eps = False
                             break
-
-                    if all_can_eps:
-                        if EPS not in first[lhs]:
-                            first[lhs].add(EPS)
-                            changed = True
-
-        return {k: frozenset(v) for k, v in first.items()}
-
-    def _first_of_sequence(self, seq: Sequence[Symbol], first: Mapping[Symbol, FrozenSet[Symbol]]) -> Tuple[Set[Symbol], bool]:
-        """返回 (FIRST(seq) 里除 ε 的终结符集合, seq 是否可推出 ε)。"""
-        EPS = "ε"
-        out: Set[Symbol] = set()
-        if len(seq) == 0:
-            return out, True
-
+                    else:
+                        # 终结符
+                        target |= bits[sym]
+                        all_can_eps = False
+                        break
+
+                if all_can_eps:
+                    target |= eps_bit
+
+            if target != before:
+                first[lhs_id] = target
+                for dep_id in deps[lhs_id]:
+                    if not pending[dep_id]:
+                        pending[dep_id] = 1
+                        worklist.append(dep_id)
+
+        return {nt: first[i] for i, nt in enumerate(nts_by_id)}
+
+    def _first_of_sequence(self, seq: RHS, first: Mapping[Symbol, int]) -> Tuple[int, bool]:
+        """返回 (FIRST(seq) 里除 ε 的终结符位集, seq 是否可推出 ε)。
+
+        仅在 first 收敛后调用（FOLLOW/SELECT 阶段），结果按后缀备忘。
+        """
+        cached = self._first_seq_cache.get(seq)
+        if cached is not None:
+            return cached
+
+        eps_bit = self._eps_bit
+        nts = self.nonterminals
+        out = 0
         for sym in seq:
-            if self.is_nonterminal(sym):
+            if sym in nts:
                 f = first[sym]
-                out.update(t for t in f if t != EPS)
-                if EPS in f:
-                    continue
-                return out, False
+                out |= f & ~eps_bit
+                if not f & eps_bit:
+                    result = (out, False)
+                    break
             else:
-                out.add(sym)
-                return out, False
-
-        return out, True
-
-    def _compute_follow(self, first: Mapping[Symbol, FrozenSet[Symbol]]) -> Dict[Symbol, FrozenSet[Symbol]]:
-        follow: Dict[Symbol, Set[Symbol]] = {nt: set() for nt in self.nonterminals}
-        follow[self.start_symbol].add("EOF")
-
-        changed = True
-        while changed:
-            changed = False
-            for lhs, rhss in self.productions.items():
-                for rhs in rhss:
-                    for i, B in enumerate(rhs):
-                        if not self.is_nonterminal(B):
-                            continue
-
-                        beta = rhs[i + 1 :]
-                        first_beta, beta_can_eps = self._first_of_sequence(beta, first)
-
-                        if not first_beta.issubset(follow[B]):
-                            follow[B].update(first_beta)
-                            changed = True
-
-                        if beta_can_eps:
-                            # FOLLOW(B) += FOLLOW(lhs)
-                            if not follow[lhs].issubset(follow[B]):
-                                follow[B].update(follow[lhs])
-                                changed = True
+                result = (out | self._symbol_bits[sym], False)
+                break
+        else:
+            result = (out, True)
+
+        self._first_seq_cache[seq] = result
+        return result
+
+    def _compute_follow(self, first: Mapping[Symbol, int]) -> Dict[Symbol, int]:
+        nts = self.nonterminals
+        nt_ids = self._nt_ids
+        nts_by_id = self._nts_by_id
+        n = len(nts_by_id)
+        follow: List[int] = [0] * n
+        follow[nt_ids[self.start_symbol]] = self._symbol_bits["EOF"]
+
+        # 产生式只走一遍：FIRST(β) 的终结符一次性注入 FOLLOW(B)；
+        # β 可空时记一条 FOLLOW(lhs) -> FOLLOW(B) 的传播边
+        edges: List[Set[int]] = [set() for _ in nts_by_id]
+        for lhs, rhs in self._prod_list:
+            lhs_id = nt_ids[lhs]
+            for i, B in enumerate(rhs):
+                if B not in nts:
+                    continue
 
-        return {k: frozenset(v) for k, v in follow.items()}
+                first_beta, beta_can_eps = self._first_of_sequence(rhs[i + 1 :], first)
+                B_id = nt_ids[B]
+                follow[B_id] |= first_beta
+                if beta_can_eps and B_id != lhs_id:
+                    edges[lhs_id].add(B_id)
+
+        # 沿传播边把种子推到不动点，同样用工作表而不是整轮重扫
+        worklist: Deque[int] = deque(range(n))
+        pending = bytearray([1]) * n
+        while worklist:
+            lhs_id = worklist.popleft()
+            pending[lhs_id] = 0
+            mask = follow[lhs_id]
+            for B_id in edges[lhs_id]:
+                new = follow[B_id] | mask
+                if new != follow[B_id]:
+                    follow[B_id] = new
+                    if not pending[B_id]:
+                        pending[B_id] = 1
+                        worklist.append(B_id)
+
+        return {nt: follow[i] for i, nt in enumerate(nts_by_id)}
 
     def _compute_select(
         self,
-        first: Mapping[Symbol, FrozenSet[Symbol]],
-        follow: Mapping[Symbol, FrozenSet[Symbol]],
-    ) -> Dict[Tuple[Symbol, RHS], FrozenSet[Symbol]]:
-        select: Dict[Tuple[Symbol, RHS], Set[Symbol]] = {}
-
-        for lhs, rhss in self.productions.items():
-            for rhs in rhss:
-                first_rhs, rhs_can_eps = self._first_of_sequence(rhs, first)
-                s: Set[Symbol] = set(first_rhs)
-                if rhs_can_eps:
-                    s.update(follow[lhs])
-                select[(lhs, rhs)] = frozenset(s)
+        first: Mapping[Symbol, int],
+        follow: Mapping[Symbol, int],
+    ) -> Dict[Tuple[Symbol, RHS], int]:
+        select: Dict[Tuple[Symbol, RHS], int] = {}
+
+        for lhs, rhs in self._prod_list:
+            first_rhs, rhs_can_eps = self._first_of_sequence(rhs, first)
+            if rhs_can_eps:
+                first_rhs |= follow[lhs]
+            select[(lhs, rhs)] = first_rhs
 
         return select
 
 
 def format_ll1_sets(sets: LL1Sets) -> str:
-    def fmt_set(items: Sequence[str]) -> str:
+    def fmt_set(items: FrozenSet[str]) -> str:
         return "{ " + ", ".join(sorted(items)) + " }"
 
     def rhs_to_str(rhs: RHS) -> str:
-        return " ".join(rhs) if rhs else "ε"
+        return " ".join(rhs) if rhs else _EPS
+
+    # 行内容不带换行，整段生成器喂给 extend，最后一次 join 收尾
+    lines: List[str] = [
+        "========================================",
+        "     LL(1) FIRST / FOLLOW / SELECT",
+        "========================================",
+        "",
+        "[FIRST]",
+    ]
+    # FIRST/FOLLOW 的键都是全部非终结符，排序一次两段共用
+    nts = sorted(sets.first.keys())
+    lines.extend(f"FIRST({nt}) = {fmt_set(sets.first[nt])}" for nt in nts)
 
-    lines: List[str] = []
-    lines.append("========================================\n")
-    lines.append("     LL(1) FIRST / FOLLOW / SELECT\n")
-    lines.append("========================================\n\n")
+    lines.append("")
+    lines.append("[FOLLOW]")
+    lines.extend(f"FOLLOW({nt}) = {fmt_set(sets.follow[nt])}" for nt in nts)
 
-    nts = sorted(sets.first.keys())
+    lines.append("")
+    lines.append("[SELECT]")
+    # 按 lhs / rhs 排序，保证输出稳定；rhs 的字符串形式只渲染一次
+    decorated = [(lhs, rhs_to_str(rhs), sel) for (lhs, rhs), sel in sets.select.items()]
+    decorated.sort(key=lambda item: (item[0], item[1]))
+    lines.extend(f"SELECT({lhs} -> {rhs_str}) = {fmt_set(sel)}" for lhs, rhs_str, sel in decorated)
 
-    lines.append("[FIRST]\n")
-    for nt in nts:
-        lines.append(f"FIRST({nt}) = {fmt_set(list(sets.first[nt]))}\n")
-    lines.append("\n")
+    return "\n".join(lines) + "\n"
 
-    lines.append("[FOLLOW]\n")
-    for nt in sorted(sets.follow.keys()):
-        lines.append(f"FOLLOW({nt}) = {fmt_set(list(sets.follow[nt]))}\n")
-    lines.append("\n")
 
-    lines.append("[SELECT]\n")
-    # 按 lhs / rhs 排序，保证输出稳定
-    items = list(sets.select.items())
-    items.sort(key=lambda kv: (kv[0][0], rhs_to_str(kv[0][1])))
-    for (lhs, rhs), sel in items:
-        lines.append(f"SELECT({lhs} -> {rhs_to_str(rhs)}) = {fmt_set(list(sel))}\n")
+# 默认文法是写死的常量，集合只算一次，后续调用直接复用
+_DEFAULT_LL1_SETS: Optional[LL1Sets] = None
 
-    return "".join(lines)
 
+def emit_dispatcher_source(sets: LL1Sets) -> str:
+    """把 LL(1) 集合渲染成可导入的 Python 模块源码（AOT 生成）。
 
-def build_default_ll1_sets() -> LL1Sets:
-    """与 [文法(LL1)与SELECT集合.md] 对齐的默认 LL(1) 文法集合。"""
+    默认文法是常量，生成的 dict/frozenset 字面量在 import 时一次建好，
+    比每次启动重新跑三个不动点更快。输出按键排序，保证重新生成可复现。
+    """
+    def fs(items: FrozenSet[Symbol]) -> str:
+        inner = ", ".join(repr(s) for s in sorted(items))
+        return f"frozenset({{{inner}}})"
+
+    lines: List[str] = [
+        '"""默认 LL(1) 文法的预计算集合与预测表。',
+        "",
+        "生成文件，勿手改；重新生成：python -m parser.ll1_sets",
+        '"""',
+        "",
+    ]
+
+    lines.append("FIRST = {")
+    for nt in sorted(sets.first):
+        lines.append(f"    {nt!r}: {fs(sets.first[nt])},")
+    lines.append("}")
+    lines.append("")
+
+    lines.append("FOLLOW = {")
+    for nt in sorted(sets.follow):
+        lines.append(f"    {nt!r}: {fs(sets.follow[nt])},")
+    lines.append("}")
+    lines.append("")
+
+    lines.append("SELECT = {")
+    for lhs, rhs in sorted(sets.select):
+        lines.append(f"    ({lhs!r}, {rhs!r}): {fs(sets.select[(lhs, rhs)])},")
+    lines.append("}")
+    lines.append("")
+
+    lines.append("PREDICT = {")
+    for lhs, la in sorted(sets.predict):
+        lines.append(f"    ({lhs!r}, {la!r}): {sets.predict[(lhs, la)]!r},")
+    lines.append("}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _compute_default_ll1_sets() -> LL1Sets:
+    """从文法字面量现场计算默认集合（表生成与加载失败兜底共用）。"""
     prods: Dict[Symbol, List[List[Symbol]]] = {
         # Program
         "Program": [["StmtList", "EOF"]],
@@ -245,3 +404,27 @@ def build_default_ll1_sets() -> LL1Sets:
 
     grammar = LL1Grammar(start_symbol="Program", productions=prods)
     return grammar.compute_first_follow_select()
+
+
+def build_default_ll1_sets() -> LL1Sets:
+    """与 [文法(LL1)与SELECT集合.md] 对齐的默认 LL(1) 文法集合。"""
+    global _DEFAULT_LL1_SETS
+    if _DEFAULT_LL1_SETS is not None:
+        return _DEFAULT_LL1_SETS
+
+    # 优先加载 AOT 生成的表（python -m parser.ll1_sets 重新生成），
+    # 免去启动时跑三个不动点；生成文件缺失时退回现场计算
+    try:
+        from parser._ll1_tables import FIRST, FOLLOW, PREDICT, SELECT
+    except ImportError:
+        _DEFAULT_LL1_SETS = _compute_default_ll1_sets()
+    else:
+        _DEFAULT_LL1_SETS = LL1Sets(first=FIRST, follow=FOLLOW, select=SELECT, predict=PREDICT)
+    return _DEFAULT_LL1_SETS
+
+
+if __name__ == "__main__":
+    # 生成时总是现场计算，避免把旧表原样抄回去
+    out_path = Path(__file__).with_name("_ll1_tables.py")
+    out_path.write_text(emit_dispatcher_source(_compute_default_ll1_sets()), encoding="utf-8")
+    print(f"已生成 {out_path}")
@@ -1,21 +1,125 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Sequence, Set, Tuple
+from typing import Callable, ClassVar, Dict, FrozenSet, List, NoReturn, Optional, Sequence, Tuple
 
 from parser.errors import ParseError, SemanticError
-from parser.stream import SyntaxToken, TokenStream
+from parser.stream import (
+    K_ADD,
+    K_ASSIGN,
+    K_EOF,
+    K_INCDEC,
+    K_MUL,
+    K_RBRACE,
+    K_REL,
+    K_SEMI,
+    K_UNARY,
+    SyntaxToken,
+    TokenStream,
+)
 from parser.tac import Quad, TACEmitter
 
 from parser.ll1_sets import build_default_ll1_sets
 
 
-_TYPE_KEYWORDS = {"int", "float", "double", "char"}
-_REL_OPS = {"<", "<=", ">", ">=", "==", "!="}
-_ADD_OPS = {"+", "-"}
-_MUL_OPS = {"*", "/"}
-_ASSIGN_OPS = {"=", "+=", "-=", "*=", "/="}
-_UNARY_PREFIX_OPS = {"+", "-", "!"}
+# 集合成员统一 intern：token.terminal 同样 intern 过，
+# in-测试的相等比较可以在指针一致时直接短路
+_TYPE_KEYWORDS = frozenset(map(sys.intern, ("int", "float", "double", "char")))
+_ASSIGN_OPS = frozenset(map(sys.intern, ("=", "+=", "-=", "*=", "/=")))
+_INCDEC_OPS = (sys.intern("++"), sys.intern("--"))
+# 复合赋值 -> 对应算术运算：提到模块级，不再每条语句重建映射
+_COMPOUND_ARITH = {"+=": "+", "-=": "-", "*=": "*", "/=": "/"}
+
+# 二元运算层级表：下标越大优先级越高，左结合；_binary 按层下降。
+# 运算符用 kind 位掩码判定，避免热循环里的字符串集合查找
+_BIN_LEVELS: Tuple[Tuple[int, str], ...] = (
+    (K_ADD, "AddExpr"),
+    (K_MUL, "MulExpr"),
+)
+
+# 语句序列停止/恐慌模式同步用的 kind 位掩码：调用点不再每次现造
+# 字符串集合，循环内一次按位与替代哈希集合成员测试；EOF 恒在掩码内
+_STOP_EOF = K_EOF
+_STOP_RBRACE = K_RBRACE | K_EOF
+_SYNC_STMT = K_SEMI | K_RBRACE | K_EOF
+
+# 爬升快路径用的 kind -> 优先级表：数字越大绑定越紧。
+# '+'/'-' 的 kind 恒为 K_ADD|K_UNARY，直接用组合值做键
+_PREC_REL = 1
+_PREC_BY_KIND: Dict[int, int] = {
+    K_REL: _PREC_REL,
+    K_ADD | K_UNARY: 2,
+    K_MUL: 3,
+}
+
+# 预先排好序的期望符号元组：报错/展示路径不再每次重做 sorted 与集合并集，
+# 元组不可变，在多个 ParseError 之间共享也安全
+_TYPE_KEYWORDS_SORTED = tuple(sorted(_TYPE_KEYWORDS))
+_ASSIGN_OR_INCDEC_EXPECTED = tuple(sorted(_ASSIGN_OPS | {"++", "--"}))
+_FOR_INIT_EXPECTED = tuple(sorted(_TYPE_KEYWORDS | {"IDENT", "++", "--", ";"}))
+_FOR_ITER_EXPECTED = tuple(sorted({"IDENT", "++", "--", ")"}))
+_STMT_START_EXPECTED = ("for", "{", ";", "IDENT", "++", "--") + _TYPE_KEYWORDS_SORTED
+
+# 日志缩进前缀缓存：按实际出现的最大深度懒增长，跨解析器实例共享
+_INDENT_PREFIXES: List[str] = [""]
+
+# 分析表展示用的 EOF 占位 token：越过语句末尾时复用同一个实例
+_EOF_DISPLAY_TOKEN = SyntaxToken("EOF", "", 0, 0, "EOF")
+
+
+# 分析表的纯函数助手提到模块级：不再每条赋值语句都重建闭包函数对象，
+# 状态显式传参，CPython 3.11 的内联缓存也更容易命中
+def _lookahead_symbol(tok: SyntaxToken) -> str:
+    # 表格里“分析字符”显示具体字符：id/num 用 lexeme，其余用 lexeme
+    if tok.terminal == "EOF":
+        return ""
+    return tok.lexeme
+
+
+def _terminal_kind(tok: SyntaxToken) -> str:
+    # 表达式预测分析用的“终结符种类”
+    if tok.terminal == "IDENT":
+        return "id"
+    if tok.terminal == "NUM":
+        return "num"
+    return tok.terminal  # '+', '-', '*', '/', '(', ')', ';', 'EOF' 等
+
+
+def _table_la_kind(stmt_tokens: List[SyntaxToken], i: int, n: int) -> str:
+    # 预测分析的“分析字符种类”：越过语句末尾视作 EOF
+    return _terminal_kind(stmt_tokens[i]) if i < n else "EOF"
+
+
+def _table_row(
+    prod: str,
+    consumed_parts: List[str],
+    stmt_tokens: List[SyntaxToken],
+    suffixes: List[str],
+    i: int,
+    n: int,
+) -> Tuple[str, str, str, str]:
+    la = stmt_tokens[i] if i < n else _EOF_DISPLAY_TOKEN
+    return (prod, "".join(consumed_parts), _lookahead_symbol(la), suffixes[i])
+
+# 赋值语句教学分析表用的 LL(1) 转移表：
+#   (栈顶, 分析字符种类) -> (产生式文本, 右部入栈, 是否消费输入)
+# 第二键为 None 表示展开与分析字符无关（Expr/Term 恒定展开）
+_ASSIGN_TABLE: Dict[Tuple[str, Optional[str]], Tuple[str, Tuple[str, ...], bool]] = {
+    ("Expr", None): ("Expr -> Term ExprP", ("ExprP", "Term"), False),
+    ("Term", None): ("Term -> Factor TermP", ("TermP", "Factor"), False),
+    ("Factor", "id"): ("Factor -> id", (), True),
+    ("Factor", "num"): ("Factor -> num", (), True),
+    ("Factor", "("): ("Factor -> ( Expr )", (")", "Expr", "("), False),
+}
+for _op in ("+", "-"):
+    _ASSIGN_TABLE[("ExprP", _op)] = (f"ExprP -> {_op} Term ExprP", ("ExprP", "Term", _op), False)
+for _op in ("*", "/"):
+    _ASSIGN_TABLE[("TermP", _op)] = (f"TermP -> {_op} Factor TermP", ("TermP", "Factor", _op), False)
+for _la in (")", ";", "EOF"):
+    _ASSIGN_TABLE[("ExprP", _la)] = ("ExprP -> ε", (), False)
+for _la in ("+", "-", ")", ";", "EOF"):
+    _ASSIGN_TABLE[("TermP", _la)] = ("TermP -> ε", (), False)
 
 
 @dataclass(frozen=True)
@@ -49,17 +153,18 @@ def _is_assignable(dst: str, src: str) -> bool:
 _LL1 = build_default_ll1_sets()
 
 
-def _select(lhs: str, rhs: Tuple[str, ...]) -> Set[str]:
-    # 返回可变集合，便于调用方与其他 set 做并集等操作
-    return set(_LL1.select[(lhs, rhs)])
+def _select(lhs: str, rhs: Tuple[str, ...]) -> FrozenSet[str]:
+    # 成员 intern 后重建：与 token.terminal 的 in-测试走指针比较
+    return frozenset(map(sys.intern, _LL1.select[(lhs, rhs)]))
 
 
-def _first(nt: str) -> Set[str]:
-    return set(_LL1.first[nt])
+def _first(nt: str) -> FrozenSet[str]:
+    return frozenset(map(sys.intern, _LL1.first[nt]))
 
 
 # FIRST 集合（用于 SELECT 集合判定）
 _FIRST_EXPR = _first("Expr")
+_FOR_COND_EXPECTED = tuple(sorted(_FIRST_EXPR | {";"}))
 
 # SELECT 集合（用于按 1 个 lookahead 选择产生式）
 _SELECT_STMT_FOR = _select("Stmt", ("ForStmt",))
@@ -74,45 +179,6 @@ _SELECT_FOR_COND_EPS = _select("ForCondOpt", ())
 _SELECT_FOR_ITER_EPS = _select("ForIterOpt", ())
 
 
-class _DeferredEmitter:
-    """把 emit 的四元式先缓存在本地，稍后再一次性写回父 emitter。
-
-    用途：for(cond/iter) 这两段在语法上出现在括号里，但中间代码应在
-    label(L_begin) 之后/循环体之后再执行。
-    """
-
-    def __init__(self, parent: TACEmitter) -> None:
-        self._parent = parent
-        self.quads: List[Quad] = []
-        self.trace: List[str] = []
-
-    def new_temp(self) -> str:
-        return self._parent.new_temp()
-
-    def new_label(self) -> str:
-        return self._parent.new_label()
-
-    def emit(self, op: str, arg1: str = "", arg2: str = "", result: str = "") -> None:
-        q = Quad(op=op, arg1=arg1, arg2=arg2, result=result)
-        self.quads.append(q)
-        self.trace.append(q.format_three_address())
-
-    def emit_label(self, label: str) -> None:
-        self.emit("label", result=label)
-
-    def emit_goto(self, label: str) -> None:
-        self.emit("goto", result=label)
-
-    def emit_if_false(self, cond_place: str, label: str) -> None:
-        self.emit("ifFalse", arg1=cond_place, result=label)
-
-    def flush_to_parent(self) -> None:
-        self._parent.quads.extend(self.quads)
-        self._parent.trace.extend(self.trace)
-        self.quads.clear()
-        self.trace.clear()
-
-
 @dataclass(frozen=True)
 class ParseResult:
     ok: bool
@@ -124,24 +190,31 @@ class ParseResult:
 
 
 class RDParser:
-    def __init__(self, stream: TokenStream):
+    def __init__(self, stream: TokenStream, trace: bool = True):
         self.s = stream
         self.errors: List[ParseError] = []
         self.semantic_errors: List[SemanticError] = []
         self.parse_trace: List[str] = []
         self._indent = 0
+        # 只要中间代码、不读 parse_trace 的调用方可关闭，
+        # 省掉每个语法结点的字符串拼装与列表追加
+        self._trace_enabled = trace
         self.emitter = TACEmitter()
 
         # 语义：符号表（支持块级作用域）
         self._scopes: List[Dict[str, str]] = [{}]
 
-        # 展示用
-        self.enable_assign_table = True
+        # 展示用：教学分析表要对每条赋值语句多做一次完整的表驱动推导，
+        # 默认关闭，只在需要出报告的调用方（如 main.py）显式打开
+        self.enable_assign_table = False
+        # 分析表渲染的复用缓冲：每次生成前 clear，避免逐条赋值语句反复分配
+        self._table_rows: List[Tuple[str, str, str, str]] = []
+        self._table_out: List[str] = []
 
     def parse_program(self) -> ParseResult:
         self._enter("Program")
         try:
-            self._stmt_list(stop_terminals={"EOF"})
+            self._stmt_list(stop_mask=_STOP_EOF)
             self._expect("EOF")
             ok = len(self.errors) == 0 and len(self.semantic_errors) == 0
         except ParseError as e:
@@ -186,97 +259,93 @@ class RDParser:
         self._log(str(e))
 
     # ---------------- trace helpers ----------------
+    # 各 helper 在关闭跟踪时直接返回，f-string 的构造也在守卫之后
     def _log(self, msg: str) -> None:
-        self.parse_trace.append("  " * self._indent + msg)
+        if not self._trace_enabled:
+            return
+        # 缩进前缀查表复用，不再每条日志都做 "  " * indent 的重复分配
+        self.parse_trace.append(_INDENT_PREFIXES[self._indent] + msg)
 
+    # _prod/_enter/_leave 直接内联追加，不再经过 _log 多付一次方法调用
     def _prod(self, lhs: str, rhs: str) -> None:
-        self._log(f"使用产生式: {lhs} -> {rhs}")
+        if not self._trace_enabled:
+            return
+        self.parse_trace.append(_INDENT_PREFIXES[self._indent] + f"使用产生式: {lhs} -> {rhs}")
 
     def _enter(self, name: str) -> None:
-        self._log(f"进入 <{name}>")
-        self._indent += 1
+        if not self._trace_enabled:
+            return
+        indent = self._indent
+        self.parse_trace.append(_INDENT_PREFIXES[indent] + f"进入 <{name}>")
+        self._indent = indent + 1
+        if self._indent >= len(_INDENT_PREFIXES):
+            _INDENT_PREFIXES.append("  " * len(_INDENT_PREFIXES))
 
     def _leave(self, name: str) -> None:
-        self._indent = max(0, self._indent - 1)
-        self._log(f"退出 <{name}>")
+        if not self._trace_enabled:
+            return
+        self._indent = indent = max(0, self._indent - 1)
+        self.parse_trace.append(_INDENT_PREFIXES[indent] + f"退出 <{name}>")
 
     # ---------------- token helpers ----------------
     def _peek(self) -> SyntaxToken:
         return self.s.peek(0)
 
+    # match 日志专用：f-string 在守卫之后才构造，
+    # 关闭跟踪时调用方不付任何格式化成本
+    def _log_match(self, terminal: str, lexeme: str) -> None:
+        if not self._trace_enabled:
+            return
+        self.parse_trace.append(_INDENT_PREFIXES[self._indent] + f"match {terminal} ({lexeme})")
+
     def _match(self, terminal: str) -> Optional[SyntaxToken]:
-        if self._peek().terminal == terminal:
+        if self.s.peek_terminal(0) == terminal:
             tok = self.s.advance()
-            self._log(f"match {terminal} ({tok.lexeme})")
+            self._log_match(terminal, tok.lexeme)
             return tok
         return None
 
-    def _expect(self, terminal: str) -> SyntaxToken:
+    # 失败分支单独成方法：_expect/_expect_any 的热路径只剩一次比较
+    # 加一个跳转，ParseError 的参数打包全部留在冷路径里
+    def _expect_fail(self, expected: Tuple[str, ...]) -> NoReturn:
         tok = self._peek()
-        if tok.terminal != terminal:
-            raise ParseError(
-                message="终结符不匹配",
-                line=tok.line,
-                column=tok.column,
-                got=tok.terminal or tok.lexeme,
-                expected=[terminal],
-            )
+        raise ParseError(
+            message="终结符不匹配",
+            line=tok.line,
+            column=tok.column,
+            got=tok.terminal or tok.lexeme,
+            expected=expected,
+        )
+
+    def _expect(self, terminal: str) -> SyntaxToken:
+        if self.s.peek_terminal(0) != terminal:
+            self._expect_fail((terminal,))
         return self.s.advance()
 
     def _expect_any(self, terminals: Sequence[str]) -> SyntaxToken:
         tok = self._peek()
         if tok.terminal not in terminals:
-            raise ParseError(
-                message="终结符不匹配",
-                line=tok.line,
-                column=tok.column,
-                got=tok.terminal or tok.lexeme,
-                expected=list(terminals),
-            )
-        self._log(f"match {tok.terminal} ({tok.lexeme})")
+            self._expect_fail(tuple(terminals))
+        self._log_match(tok.terminal, tok.lexeme)
         return self.s.advance()
 
-    def _sync_to(self, sync: Set[str]) -> None:
-        # 恐慌模式：跳过直到遇到同步集合中的 token 或 EOF
-        while self._peek().terminal not in sync and self._peek().terminal != "EOF":
-            self.s.advance()
+    def _sync_to(self, sync_mask: int) -> None:
+        # 恐慌模式：跳过直到遇到同步掩码中的 token（掩码必含 EOF）。
+        # 热循环里把方法绑定为局部变量，每轮只做一次按位与
+        peek_kind = self.s.peek_kind
+        advance = self.s.advance
+        while not (peek_kind(0) & sync_mask):
+            advance()
 
     # ---------------- assign stmt analysis table (textbook style) ----------------
-    @staticmethod
-    def _stmt_lexemes(tokens: List[SyntaxToken]) -> str:
-        return "".join(t.lexeme for t in tokens if t.terminal != "EOF")
-
-    @staticmethod
-    def _lookahead_symbol(tok: SyntaxToken) -> str:
-        # 表格里“分析字符”显示具体字符：id/num 用 lexeme，其余用 lexeme
-        if tok.terminal in {"IDENT", "NUM"}:
-            return tok.lexeme
-        if tok.terminal == "EOF":
-            return ""
-        return tok.lexeme
-
-    @staticmethod
-    def _terminal_kind(tok: SyntaxToken) -> str:
-        # 表达式预测分析用的“终结符种类”
-        if tok.terminal == "IDENT":
-            return "id"
-        if tok.terminal == "NUM":
-            return "num"
-        if tok.terminal == "EOF":
-            return "EOF"
-        return tok.terminal  # '+', '-', '*', '/', '(', ')', ';', '=' 等
-
     def _collect_assign_stmt_tokens(self, require_semicolon: bool, limit: int = 200) -> List[SyntaxToken]:
-        # 从当前 token 起，向后收集到 ';'（包含）为止，用于生成分析表；不移动流位置
-        out: List[SyntaxToken] = []
-        for k in range(limit):
-            t = self.s.peek(k)
-            out.append(t)
-            if t.terminal == "EOF":
-                break
-            if require_semicolon and t.terminal == ";":
-                break
-        return out
+        # 从当前 token 起，向后收集到 ';'（包含）为止，用于生成分析表；不移动流位置。
+        # 一次切片代替逐个 peek(k)：200 次方法调用变成一次 C 层切片加一个短循环
+        toks = self.s.slice_from_current(limit)
+        for i, t in enumerate(toks):
+            if t.terminal == "EOF" or (require_semicolon and t.terminal == ";"):
+                return toks[: i + 1]
+        return toks
 
     def _build_assign_table_text(self, stmt_tokens: List[SyntaxToken]) -> List[str]:
         # 只对形如：IDENT (ASSIGN_OP) Expr ;
@@ -305,122 +374,79 @@ class RDParser:
             return []
         stmt_tokens = stmt_tokens[: end_idx + 1]
 
-        full_stmt = self._stmt_lexemes(stmt_tokens)
-        lhs = stmt_tokens[0].lexeme
+        # 词素只取一次；剩余串用后缀数组 O(1) 查询，不再每行重新 join
+        lexemes = [t.lexeme for t in stmt_tokens]
+        n = len(stmt_tokens)
+        suffixes = [""] * (n + 1)
+        for k in range(n - 1, -1, -1):
+            suffixes[k] = lexemes[k] + suffixes[k + 1]
+
+        full_stmt = suffixes[0]
+        lhs = lexemes[0]
 
         # 输入指针 i 指向当前 lookahead
         i = 0
-        consumed = ""  # 分析串
-
-        def remaining() -> str:
-            return "".join(t.lexeme for t in stmt_tokens[i:])
+        consumed_parts: List[str] = []  # 分析串：只追加，生成行时快照 join
 
-        rows: List[List[str]] = []
-
-        def add_row(prod: str) -> None:
-            la = stmt_tokens[i] if i < len(stmt_tokens) else SyntaxToken("EOF", "", 0, 0, "EOF")
-            rows.append([prod, consumed, self._lookahead_symbol(la), remaining()])
+        rows = self._table_rows
+        rows.clear()
+        add_row = rows.append
 
         # 1) S -> id op Expr ;
-        add_row(f"S -> id {op_lexeme} Expr ;")
+        add_row(_table_row(f"S -> id {op_lexeme} Expr ;", consumed_parts, stmt_tokens, suffixes, i, n))
 
         # 隐式 match: id 与 op
-        consumed += stmt_tokens[0].lexeme
+        consumed_parts.append(lexemes[0])
         i += 1
-        consumed += stmt_tokens[1].lexeme
+        consumed_parts.append(lexemes[1])
         i += 1
 
         # 预测分析栈（只用于驱动产生式选择，不输出）
         stack: List[str] = [";", "Expr"]
 
-        def kind() -> str:
-            if i >= len(stmt_tokens):
-                return "EOF"
-            return self._terminal_kind(stmt_tokens[i])
-
+        table_get = _ASSIGN_TABLE.get
         while stack:
             top = stack.pop()
-            la_kind = kind()
+            la_kind = _table_la_kind(stmt_tokens, i, n)
 
             if top == ";":
                 # 匹配分号
                 if la_kind == ";":
-                    consumed += stmt_tokens[i].lexeme
+                    consumed_parts.append(lexemes[i])
                     i += 1
                     # 记录分号已被消费，避免表格最后一行仍显示剩余 ';'
-                    add_row("match ;")
+                    add_row(_table_row("match ;", consumed_parts, stmt_tokens, suffixes, i, n))
                     continue
                 # 不匹配就停止生成表
                 break
 
-            if top == "Expr":
-                add_row("Expr -> Term ExprP")
-                stack.extend(["ExprP", "Term"])
+            # 查 LL(1) 转移表：先按 (栈顶, 分析字符)，再退回与分析字符无关的展开
+            entry = table_get((top, la_kind)) or table_get((top, None))
+            if entry is not None:
+                prod, push, consume = entry
+                add_row(_table_row(prod, consumed_parts, stmt_tokens, suffixes, i, n))
+                if consume:
+                    consumed_parts.append(lexemes[i])
+                    i += 1
+                elif push:
+                    stack.extend(push)
                 continue
 
-            if top == "ExprP":
-                if la_kind in {"+", "-"}:
-                    op = la_kind
-                    add_row(f"ExprP -> {op} Term ExprP")
-                    # 产生式右部：op Term ExprP
-                    stack.extend(["ExprP", "Term", op])
-                    continue
-                if la_kind in {")", ";", "EOF"}:
-                    add_row("ExprP -> ε")
-                    continue
-                break
-
-            if top == "Term":
-                add_row("Term -> Factor TermP")
-                stack.extend(["TermP", "Factor"])
+            # 终结符：+ - * / ( ) 直接匹配
+            if top == la_kind:
+                consumed_parts.append(lexemes[i])
+                i += 1
                 continue
 
-            if top == "TermP":
-                if la_kind in {"*", "/"}:
-                    op = la_kind
-                    add_row(f"TermP -> {op} Factor TermP")
-                    stack.extend(["TermP", "Factor", op])
-                    continue
-                if la_kind in {"+", "-", ")", ";", "EOF"}:
-                    add_row("TermP -> ε")
-                    continue
-                break
-
-            if top == "Factor":
-                if la_kind == "id":
-                    add_row("Factor -> id")
-                    # 匹配 id
-                    consumed += stmt_tokens[i].lexeme
-                    i += 1
-                    continue
-                if la_kind == "num":
-                    add_row("Factor -> num")
-                    consumed += stmt_tokens[i].lexeme
-                    i += 1
-                    continue
-                if la_kind == "(":
-                    add_row("Factor -> ( Expr )")
-                    # 推入 ) Expr (
-                    stack.extend([")", "Expr", "("])
-                    continue
-                break
-
-            # 终结符：+ - * / ( )
-            if top in {"+", "-", "*", "/", "(", ")"}:
-                if la_kind == top:
-                    consumed += stmt_tokens[i].lexeme
-                    i += 1
-                    continue
-                break
-
-            # 兜底：未知符号
+            # 兜底：表中无此 (栈顶, 分析字符) 组合，停止生成表
             break
 
         if not rows:
             return []
 
         # 按用户要求：只有表头那一行保留竖线；数据行用空格对齐拉开列间距。
-        out: List[str] = []
+        out = self._table_out
+        out.clear()
         out.append("")
         out.append(f"【赋值语句分析表】{full_stmt}")
 
@@ -440,68 +466,86 @@ class RDParser:
                 f"{rem}"
             )
         out.append("")
-        return out
+        # 返回拷贝：调用方会把这些行留到语句解析完再并入 parse_trace
+        return list(out)
 
     # ---------------- grammar ----------------
-    def _stmt_list(self, stop_terminals: Set[str]) -> None:
+    def _stmt_list(self, stop_mask: int) -> None:
         self._enter("StmtList")
-        while self._peek().terminal not in stop_terminals:
-            if self._peek().terminal == "EOF":
-                break
+        peek_kind = self.s.peek_kind
+        while not (peek_kind(0) & stop_mask):
             self._stmt()
         self._leave("StmtList")
 
+    # 语句级分发表：terminal -> 未绑定处理方法，类定义结束后由 SELECT 集合生成。
+    # LL(1) 保证同一左部的 SELECT 集合两两不交，平铺成一个 dict 是安全的
+    _STMT_TABLE: ClassVar[Dict[str, Callable[["RDParser"], None]]]
+
+    def _stmt_for(self) -> None:
+        self._prod("Stmt", "ForStmt")
+        self._for_stmt()
+
+    def _stmt_block(self) -> None:
+        self._prod("Stmt", "Block")
+        self._block()
+
+    def _stmt_decl(self) -> None:
+        # 声明语句
+        self._prod("Stmt", "DeclStmt ;")
+        self._decl_stmt(require_semicolon=True)
+
+    def _stmt_empty(self) -> None:
+        self._prod("Stmt", ";")
+        self._expect(";")
+
+    def _stmt_prefix_incdec(self) -> None:
+        # 自增自减语句（前缀）
+        self._prod("Stmt", "IncDec ;")
+        self._incdec(require_semicolon=True)
+
+    def _stmt_ident(self) -> None:
+        # IDENT 开头：通过 lookahead 选择 IncDec / Assign
+        tok = self._peek()
+        la2_kind = self.s.peek_kind(1)
+        if la2_kind & K_INCDEC:
+            self._prod("Stmt", "IncDec ;")
+            self._incdec(require_semicolon=True)
+        elif la2_kind & K_ASSIGN:
+            self._prod("Stmt", "AssignStmt ;")
+            self._assign_stmt(require_semicolon=True)
+        else:
+            raise ParseError(
+                message="IDENT 起始语句缺少 ++/-- 或赋值运算符",
+                line=tok.line,
+                column=tok.column,
+                got=self.s.peek_terminal(1),
+                expected=_ASSIGN_OR_INCDEC_EXPECTED,
+            )
+
     def _stmt(self) -> None:
         self._enter("Stmt")
         tok = self._peek()
         try:
-            if tok.terminal in _SELECT_STMT_FOR:
-                self._prod("Stmt", "ForStmt")
-                self._for_stmt()
-            elif tok.terminal in _SELECT_STMT_BLOCK:
-                self._prod("Stmt", "Block")
-                self._block()
-            elif tok.terminal in _SELECT_STMT_DECL:
-                # 声明语句
-                self._prod("Stmt", "DeclStmt ;")
-                self._decl_stmt(require_semicolon=True)
-            elif tok.terminal in _SELECT_STMT_EMPTY:
-                self._prod("Stmt", ";")
-                self._expect(";")
-            elif tok.terminal in _SELECT_STMT_PREFIX_INCDEC:
-                # 自增自减语句（前缀）
-                self._prod("Stmt", "IncDec ;")
-                self._incdec(require_semicolon=True)
-            elif tok.terminal in _SELECT_STMT_IDENT:
-                # IDENT 开头：通过 lookahead 选择 IncDec / Assign
-                la2 = self.s.peek(1).terminal
-                if la2 in {"++", "--"}:
-                    self._prod("Stmt", "IncDec ;")
-                    self._incdec(require_semicolon=True)
-                elif la2 in _ASSIGN_OPS:
-                    self._prod("Stmt", "AssignStmt ;")
-                    self._assign_stmt(require_semicolon=True)
-                else:
-                    raise ParseError(
-                        message="IDENT 起始语句缺少 ++/-- 或赋值运算符",
-                        line=tok.line,
-                        column=tok.column,
-                        got=la2,
-                        expected=sorted(list(_ASSIGN_OPS | {"++", "--"})),
-                    )
-            else:
+            # 典型程序里绝大多数语句以 IDENT 开头（赋值/自增），
+            # 先判等短路，其余起始符再查分发表
+            if tok.terminal == "IDENT":
+                self._stmt_ident()
+                return
+            handler = self._STMT_TABLE.get(tok.terminal)
+            if handler is None:
                 raise ParseError(
                     message="无法识别的语句起始符",
                     line=tok.line,
                     column=tok.column,
                     got=tok.terminal,
-                    expected=["for", "{", ";", "IDENT", "++", "--"] + sorted(_TYPE_KEYWORDS),
+                    expected=_STMT_START_EXPECTED,
                 )
+            handler(self)
         except ParseError as e:
             self.errors.append(e)
             self._log(str(e))
             # 恢复：跳过到 ; 或 } 或 EOF
-            self._sync_to({";", "}", "EOF"})
+            self._sync_to(_SYNC_STMT)
             if self._peek().terminal == ";":
                 self.s.advance()
         finally:
@@ -511,7 +555,7 @@ class RDParser:
         self._enter("Block")
         self._expect("{")
         self._push_scope()
-        self._stmt_list(stop_terminals={"}"})
+        self._stmt_list(stop_mask=_STOP_RBRACE)
         self._pop_scope()
         self._expect("}")
         self._leave("Block")
@@ -522,16 +566,14 @@ class RDParser:
         self._expect("for")
         self._expect("(")
 
-        # init: ForInitOpt
-        if self._peek().terminal in _TYPE_KEYWORDS:
-            self._prod("ForInitOpt", "DeclStmt")
-            self._decl_stmt(require_semicolon=False)
-        elif self._peek().terminal == "IDENT":
-            la2 = self.s.peek(1).terminal
-            if la2 in {"++", "--"}:
+        # init: ForInitOpt（各分支起始符互不相交，按出现频率排序）
+        init_term = self._peek().terminal
+        if init_term == "IDENT":
+            la2_kind = self.s.peek_kind(1)
+            if la2_kind & K_INCDEC:
                 self._prod("ForInitOpt", "IncDec")
                 self._incdec(require_semicolon=False)
-            elif la2 in _ASSIGN_OPS:
+            elif la2_kind & K_ASSIGN:
                 self._prod("ForInitOpt", "AssignStmt")
                 self._assign_stmt(require_semicolon=False)
             else:
@@ -539,14 +581,17 @@ class RDParser:
                     message="for-init: IDENT 后缺少 ++/-- 或赋值运算符",
                     line=self._peek().line,
                     column=self._peek().column,
-                    got=la2,
-                    expected=sorted(list(_ASSIGN_OPS | {"++", "--"})),
+                    got=self.s.peek_terminal(1),
+                    expected=_ASSIGN_OR_INCDEC_EXPECTED,
                 )
-        elif self._peek().terminal in _SELECT_STMT_PREFIX_INCDEC:
+        elif init_term in _TYPE_KEYWORDS:
+            self._prod("ForInitOpt", "DeclStmt")
+            self._decl_stmt(require_semicolon=False)
+        elif init_term in _SELECT_STMT_PREFIX_INCDEC:
             # 自增自减语句（前缀）
             self._prod("ForInitOpt", "IncDec")
             self._incdec(require_semicolon=False)
-        elif self._peek().terminal in _SELECT_FOR_INIT_EPS:
+        elif init_term in _SELECT_FOR_INIT_EPS:
             # 空
             self._prod("ForInitOpt", "ε")
         else:
@@ -554,24 +599,25 @@ class RDParser:
                 message="for-init: 不支持的起始符",
                 line=self._peek().line,
                 column=self._peek().column,
-                got=self._peek().terminal,
-                expected=sorted(list(_TYPE_KEYWORDS | {"IDENT", "++", "--", ";"})),
+                got=init_term,
+                expected=_FOR_INIT_EXPECTED,
             )
         self._expect(";")
 
-        # cond: ForCondOpt（先解析并缓冲，等 L_begin 之后再 flush）
+        # cond: ForCondOpt（检查点回卷：直接写进主 emitter 再整段取出，
+        # 等 L_begin 之后再 replay 回来）
         cond_place: Optional[str] = None
-        cond_buf = _DeferredEmitter(self.emitter)
-        if self._peek().terminal in _FIRST_EXPR:
+        cond_tail: List[Quad] = []
+        if self.s.peek_terminal(0) in _FIRST_EXPR:
             self._prod("ForCondOpt", "Expr")
-            saved = self.emitter
-            self.emitter = cond_buf
+            cp = self.emitter.mark()
             try:
                 cond_attr = self._expr()
                 cond_place = cond_attr.place
             finally:
-                self.emitter = saved
-        elif self._peek().terminal in _SELECT_FOR_COND_EPS:
+                # 出错时同样截断：半截 cond 的四元式不会留在主序列里
+                cond_tail = self.emitter.extract_since(cp)
+        elif self.s.peek_terminal(0) in _SELECT_FOR_COND_EPS:
             self._prod("ForCondOpt", "ε")
         else:
             raise ParseError(
@@ -579,41 +625,39 @@ class RDParser:
                 line=self._peek().line,
                 column=self._peek().column,
                 got=self._peek().terminal,
-                expected=sorted(list(_FIRST_EXPR | {";"})),
+                expected=_FOR_COND_EXPECTED,
             )
         self._expect(";")
 
-        # iter: ForIterOpt（先解析并缓冲，等循环体之后再 flush）
-        iter_buf = _DeferredEmitter(self.emitter)
-        if self._peek().terminal == "IDENT":
-            la2 = self.s.peek(1).terminal
+        # iter: ForIterOpt（同上：先取出，等循环体之后再 replay）
+        iter_tail: List[Quad] = []
+        if self.s.peek_terminal(0) == "IDENT":
+            la2_kind = self.s.peek_kind(1)
             self._prod("ForIterOpt", "AssignStmt | IncDec")
-            saved = self.emitter
-            self.emitter = iter_buf
+            cp = self.emitter.mark()
             try:
-                if la2 in {"++", "--"}:
+                if la2_kind & K_INCDEC:
                     self._incdec(require_semicolon=False)
-                elif la2 in _ASSIGN_OPS:
+                elif la2_kind & K_ASSIGN:
                     self._assign_stmt(require_semicolon=False)
                 else:
                     raise ParseError(
                         message="for-iter: IDENT 后缺少 ++/-- 或赋值运算符",
                         line=self._peek().line,
                         column=self._peek().column,
-                        got=la2,
-                        expected=sorted(list(_ASSIGN_OPS | {"++", "--"})),
+                        got=self.s.peek_terminal(1),
+                        expected=_ASSIGN_OR_INCDEC_EXPECTED,
                     )
             finally:
-                self.emitter = saved
-        elif self._peek().terminal in _SELECT_STMT_PREFIX_INCDEC:
+                iter_tail = self.emitter.extract_since(cp)
+        elif self.s.peek_terminal(0) in _SELECT_STMT_PREFIX_INCDEC:
             self._prod("ForIterOpt", "IncDec")
-            saved = self.emitter
-            self.emitter = iter_buf
+            cp = self.emitter.mark()
             try:
                 self._incdec(require_semicolon=False)
             finally:
-                self.emitter = saved
-        elif self._peek().terminal in _SELECT_FOR_ITER_EPS:
+                iter_tail = self.emitter.extract_since(cp)
+        elif self.s.peek_terminal(0) in _SELECT_FOR_ITER_EPS:
             self._prod("ForIterOpt", "ε")
         else:
             raise ParseError(
@@ -621,7 +665,7 @@ class RDParser:
                 line=self._peek().line,
                 column=self._peek().column,
                 got=self._peek().terminal,
-                expected=sorted(list({"IDENT", "++", "--", ")"})),
+                expected=_FOR_ITER_EXPECTED,
             )
         self._expect(")")
 
@@ -634,14 +678,14 @@ class RDParser:
 
         # cond: 每轮循环都在 L_begin 后重新计算条件
         if cond_place is not None:
-            cond_buf.flush_to_parent()
+            self.emitter.replay(cond_tail)
             self.emitter.emit_if_false(cond_place, L_end)
 
         # body
         self._stmt()
 
         # iter: 循环体之后再执行迭代表达式
-        iter_buf.flush_to_parent()
+        self.emitter.replay(iter_tail)
 
         self.emitter.emit_goto(L_begin)
         self.emitter.emit_label(L_end)
@@ -650,7 +694,7 @@ class RDParser:
 
     def _decl_stmt(self, require_semicolon: bool) -> None:
         self._enter("DeclStmt")
-        type_tok = self._expect_any(sorted(_TYPE_KEYWORDS))
+        type_tok = self._expect_any(_TYPE_KEYWORDS)
         ident = self._expect("IDENT")
 
         if not self._declare(ident.lexeme, type_tok.lexeme):
@@ -673,9 +717,10 @@ class RDParser:
 
     def _assign_stmt(self, require_semicolon: bool) -> None:
         self._enter("AssignStmt")
-        # 先“偷看”本条赋值语句的 token 串，生成教材格式分析表（不影响真正解析）
+        # 先“偷看”本条赋值语句的 token 串，生成教材格式分析表（不影响真正解析）。
+        # 表格最终写进 parse_trace，跟踪关闭时没人能读到，连模拟都不做
         table_lines: List[str] = []
-        if self.enable_assign_table and require_semicolon:
+        if self._trace_enabled and self.enable_assign_table and require_semicolon:
             stmt_tokens = self._collect_assign_stmt_tokens(require_semicolon=require_semicolon)
             table_lines = self._build_assign_table_text(stmt_tokens)
 
@@ -691,7 +736,7 @@ class RDParser:
     def _assign_expr(self) -> str:
         self._enter("AssignExpr")
         ident = self._expect("IDENT")
-        op_tok = self._expect_any(sorted(_ASSIGN_OPS))
+        op_tok = self._expect_any(_ASSIGN_OPS)
         rhs = self._expr()
 
         lhs_type = self._lookup_type(ident.lexeme)
@@ -715,11 +760,9 @@ class RDParser:
             self.emitter.emit("=", rhs.place, "", ident.lexeme)
         else:
             # x += y 等价于 x = x + y
-            mapping = {"+=": "+", "-=": "-", "*=": "*", "/=": "/"}
-            arith = mapping[op_tok.terminal]
+            arith = _COMPOUND_ARITH[op_tok.terminal]
             t = self.emitter.new_temp()
-            self.emitter.emit(arith, ident.lexeme, rhs.place, t)
-            self.emitter.emit("=", t, "", ident.lexeme)
+            self.emitter.emit_many(((arith, ident.lexeme, rhs.place, t), ("=", t, "", ident.lexeme)))
 
         self._leave("AssignExpr")
         return ident.lexeme
@@ -727,12 +770,12 @@ class RDParser:
     def _incdec(self, require_semicolon: bool) -> None:
         self._enter("IncDec")
         # 支持 i++ / i-- / ++i / --i
-        if self._peek().terminal in {"++", "--"}:
+        if self.s.peek_kind(0) & K_INCDEC:
             op = self.s.advance().terminal
             ident = self._expect("IDENT")
         else:
             ident = self._expect("IDENT")
-            op = self._expect_any(["++", "--"]).terminal
+            op = self._expect_any(_INCDEC_OPS).terminal
 
         one = "1"
         t = self.emitter.new_temp()
@@ -743,11 +786,8 @@ class RDParser:
         elif not _is_numeric(lhs_type):
             self._sem_error(ident, "自增/自减要求数值类型", ident.lexeme)
 
-        if op == "++":
-            self.emitter.emit("+", ident.lexeme, one, t)
-        else:
-            self.emitter.emit("-", ident.lexeme, one, t)
-        self.emitter.emit("=", t, "", ident.lexeme)
+        arith = "+" if op == "++" else "-"
+        self.emitter.emit_many(((arith, ident.lexeme, one, t), ("=", t, "", ident.lexeme)))
 
         if require_semicolon:
             self._expect(";")
@@ -755,78 +795,111 @@ class RDParser:
 
     # ---------------- expr ----------------
     def _expr(self) -> str:
+        # 关闭跟踪时没人读逐层的 进入/退出 日志，
+        # 走折叠掉 Expr/AddExpr/MulExpr 三层递归的爬升快路径
+        if not self._trace_enabled:
+            return self._expr_climb()
         self._enter("Expr")
-        left = self._add_expr()
+        peek_kind = self.s.peek_kind
+        advance = self.s.advance
+        left = self._binary()
         # 允许 relop 链（展示用），实际常见只写一次
-        while self._peek().terminal in _REL_OPS:
-            op = self.s.advance().terminal
-            right = self._add_expr()
+        while peek_kind(0) & K_REL:
+            op = advance().terminal
+            right = self._binary()
             t = self.emitter.new_temp()
             self.emitter.emit(op, left.place, right.place, t)
             left = ExprAttr(place=t, typ="int")
         self._leave("Expr")
         return left
 
-    def _add_expr(self) -> ExprAttr:
-        self._enter("AddExpr")
-        left = self._mul_expr()
-        while self._peek().terminal in _ADD_OPS:
-            op = self.s.advance().terminal
-            right = self._mul_expr()
+    def _expr_climb(self, min_prec: int = 1) -> ExprAttr:
+        # 优先级爬升：一个循环吃掉所有二元层级，单操作数表达式只付
+        # 一层 Python 帧。四元式顺序、临时变量编号与语义检查同
+        # _expr/_binary 的分层递归完全一致，仅用于 trace 关闭时
+        peek_kind = self.s.peek_kind
+        advance = self.s.advance
+        prec_of = _PREC_BY_KIND.get
+        left = self._unary()
+        while True:
+            prec = prec_of(peek_kind(0), 0)
+            if prec < min_prec:
+                return left
+            op = advance().terminal
+            right = self._expr_climb(prec + 1)
             t = self.emitter.new_temp()
-            if not (_is_numeric(left.typ) and _is_numeric(right.typ)):
-                self._sem_error(self._peek(), "算术运算要求数值类型", op)
+            if prec > _PREC_REL:
+                # 算术层级才有数值类型检查与类型提升，关系运算结果恒为 int
+                if not (_is_numeric(left.typ) and _is_numeric(right.typ)):
+                    self._sem_error(self._peek(), "算术运算要求数值类型", op)
+                typ = _promote(left.typ, right.typ)
+            else:
+                typ = "int"
             self.emitter.emit(op, left.place, right.place, t)
-            left = ExprAttr(place=t, typ=_promote(left.typ, right.typ))
-        self._leave("AddExpr")
-        return left
-
-    def _mul_expr(self) -> ExprAttr:
-        self._enter("MulExpr")
-        left = self._unary()
-        while self._peek().terminal in _MUL_OPS:
-            op = self.s.advance().terminal
-            right = self._unary()
+            left = ExprAttr(place=t, typ=typ)
+
+    def _binary(self, level: int = 0) -> ExprAttr:
+        # 按 _BIN_LEVELS 逐层下降的左结合二元运算：AddExpr/MulExpr 共用
+        # 同一套循环。保留逐层的 进入/退出 日志与原两个方法完全一致
+        if level >= len(_BIN_LEVELS):
+            return self._unary()
+        op_mask, name = _BIN_LEVELS[level]
+        self._enter(name)
+        peek_kind = self.s.peek_kind
+        advance = self.s.advance
+        next_level = level + 1
+        left = self._binary(next_level)
+        while peek_kind(0) & op_mask:
+            op = advance().terminal
+            right = self._binary(next_level)
             t = self.emitter.new_temp()
             if not (_is_numeric(left.typ) and _is_numeric(right.typ)):
                 self._sem_error(self._peek(), "算术运算要求数值类型", op)
             self.emitter.emit(op, left.place, right.place, t)
             left = ExprAttr(place=t, typ=_promote(left.typ, right.typ))
-        self._leave("MulExpr")
+        self._leave(name)
         return left
 
     def _unary(self) -> ExprAttr:
-        self._enter("Unary")
-        if self._peek().terminal in _UNARY_PREFIX_OPS:
-            op = self.s.advance().terminal
-            x = self._unary()
-            # 一元 + 直接返回；- 与 ! 生成临时
+        # 迭代式：先收集整条前缀链，再解析操作数，最后按内向外的顺序
+        # 施加运算。进入/退出 日志与原来的逐层递归逐条对应
+        peek_kind = self.s.peek_kind
+        advance = self.s.advance
+        ops: List[str] = []
+        while True:
+            self._enter("Unary")
+            if peek_kind(0) & K_UNARY:
+                ops.append(advance().terminal)
+            else:
+                break
+
+        x = self._primary()
+        self._leave("Unary")  # 对应最内层（无前缀）的那次进入
+
+        for op in reversed(ops):
+            # 一元 + 不生成代码；- 与 ! 生成临时
             if op == "+":
                 self._leave("Unary")
-                return x
+                continue
             t = self.emitter.new_temp()
             if op == "-":
                 if not _is_numeric(x.typ):
                     self._sem_error(self._peek(), "一元负号要求数值类型", "-")
                 self.emitter.emit("-", "0", x.place, t)
-                self._leave("Unary")
-                return ExprAttr(place=t, typ=x.typ)
+                x = ExprAttr(place=t, typ=x.typ)
             else:
                 # !x 记作 t = ! x（作为四元式打印用）
                 self.emitter.emit("!", x.place, "", t)
-                self._leave("Unary")
-                return ExprAttr(place=t, typ="int")
-
-        place = self._primary()
-        self._leave("Unary")
-        return place
+                x = ExprAttr(place=t, typ="int")
+            self._leave("Unary")
+        return x
 
     def _primary(self) -> ExprAttr:
         self._enter("Primary")
         tok = self._peek()
         if tok.terminal == "IDENT":
             t = self.s.advance()
-            self._log(f"match IDENT ({t.lexeme})")
+            self._log_match("IDENT", t.lexeme)
             typ = self._lookup_type(t.lexeme)
             if typ is None:
                 self._sem_error(t, "使用了未声明的标识符", t.lexeme)
@@ -835,7 +908,7 @@ class RDParser:
             return ExprAttr(place=t.lexeme, typ=typ)
         if tok.terminal == "NUM":
             t = self.s.advance()
-            self._log(f"match NUM ({t.lexeme})")
+            self._log_match("NUM", t.lexeme)
             typ = "float" if "." in t.lexeme else "int"
             self._leave("Primary")
             return ExprAttr(place=t.lexeme, typ=typ)
@@ -851,5 +924,24 @@ class RDParser:
             line=tok.line,
             column=tok.column,
             got=tok.terminal,
-            expected=["IDENT", "NUM", "("],
+            expected=("IDENT", "NUM", "("),
         )
+
+
+def _build_stmt_table() -> Dict[str, Callable[[RDParser], None]]:
+    # 导入期把逐个 SELECT 集合的顺序判断平铺为 terminal -> handler 的一次查表
+    table: Dict[str, Callable[[RDParser], None]] = {}
+    for select, handler in (
+        (_SELECT_STMT_FOR, RDParser._stmt_for),
+        (_SELECT_STMT_BLOCK, RDParser._stmt_block),
+        (_SELECT_STMT_DECL, RDParser._stmt_decl),
+        (_SELECT_STMT_EMPTY, RDParser._stmt_empty),
+        (_SELECT_STMT_PREFIX_INCDEC, RDParser._stmt_prefix_incdec),
+        (_SELECT_STMT_IDENT, RDParser._stmt_ident),
+    ):
+        for terminal in select:
+            table[terminal] = handler
+    return table
+
+
+RDParser._STMT_TABLE = _build_stmt_table()
@@ -1,62 +1,160 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional
+import sys
+from typing import Dict, List, NamedTuple, Optional
 
 from lexer.token import Token
 
 
-@dataclass(frozen=True)
-class SyntaxToken:
+# token 种类位标志：语法分析热路径用 kind 位测试代替字符串集合成员查找。
+# '+'/'-' 既是加法运算符又是一元前缀，因此带两个标志位
+K_IDENT = 1 << 0
+K_NUM = 1 << 1
+K_TYPE = 1 << 2
+K_ASSIGN = 1 << 3
+K_INCDEC = 1 << 4
+K_REL = 1 << 5
+K_ADD = 1 << 6
+K_MUL = 1 << 7
+K_UNARY = 1 << 8
+K_SEMI = 1 << 9
+K_RBRACE = 1 << 10
+K_EOF = 1 << 11
+
+_KIND_BY_TERMINAL: Dict[str, int] = {
+    "IDENT": K_IDENT,
+    "NUM": K_NUM,
+    "int": K_TYPE,
+    "float": K_TYPE,
+    "double": K_TYPE,
+    "char": K_TYPE,
+    "=": K_ASSIGN,
+    "+=": K_ASSIGN,
+    "-=": K_ASSIGN,
+    "*=": K_ASSIGN,
+    "/=": K_ASSIGN,
+    "++": K_INCDEC,
+    "--": K_INCDEC,
+    "<": K_REL,
+    "<=": K_REL,
+    ">": K_REL,
+    ">=": K_REL,
+    "==": K_REL,
+    "!=": K_REL,
+    "+": K_ADD | K_UNARY,
+    "-": K_ADD | K_UNARY,
+    "*": K_MUL,
+    "/": K_MUL,
+    "!": K_UNARY,
+    ";": K_SEMI,
+    "}": K_RBRACE,
+    "EOF": K_EOF,
+}
+
+
+# 词法类别 -> 终结符的直接映射；lexeme 本身当终结符的类别单独列出。
+# 提到模块级：from_lex_token 每个 token 调一次，不再走 if/elif 链
+_SIMPLE_TERMINALS: Dict[str, str] = {
+    "IDENTIFIER": "IDENT",
+    "INTEGER": "NUM",
+    "FLOAT": "NUM",
+    "STRING": "STRING",
+    "ERROR": "ERROR",
+}
+_LEXEME_TERMINAL_TYPES = frozenset({"KEYWORD", "OPERATOR", "DELIMITER"})
+
+
+# NamedTuple 而非 frozen dataclass：构造与属性读都走 C 层的元组
+# 槽位，省掉 dataclass 为不可变性生成的 Python 级 __setattr__ 包装
+class SyntaxToken(NamedTuple):
     terminal: str
     lexeme: str
     line: int
     column: int
     raw_type: str
+    # 终结符的整数种类位：查不到的终结符为 0
+    kind: int = 0
 
     @staticmethod
     def from_lex_token(tok: Token) -> "SyntaxToken":
         # 终结符归一化：关键字/运算符/分隔符用 lexeme；标识符与数值用类别。
-        if tok.type == "KEYWORD":
-            terminal = tok.lexeme
-        elif tok.type == "IDENTIFIER":
-            terminal = "IDENT"
-        elif tok.type in {"INTEGER", "FLOAT"}:
-            terminal = "NUM"
-        # 运算符和分隔符
-        elif tok.type in {"OPERATOR", "DELIMITER"}:
-            terminal = tok.lexeme
-        elif tok.type == "STRING":
-            terminal = "STRING"
-        elif tok.type == "ERROR":
-            terminal = "ERROR"
-        else:
-            terminal = tok.type
-        return SyntaxToken(terminal=terminal, lexeme=tok.lexeme, line=tok.line, column=tok.column, raw_type=tok.type)
+        # 一次 dict 查表替代 if/elif 链；来自 lexeme 的终结符统一 intern，
+        # 下游大量 in-集合测试可走指针比较
+        terminal = _SIMPLE_TERMINALS.get(tok.type)
+        if terminal is None:
+            if tok.type in _LEXEME_TERMINAL_TYPES:
+                terminal = sys.intern(tok.lexeme)
+            else:
+                terminal = tok.type
+        # lexeme 同样 intern：标识符词素既当符号表键又当四元式操作数，
+        # 同名多次出现时共享一份字符串，dict 查找命中指针比较
+        return SyntaxToken(
+            terminal=terminal,
+            lexeme=sys.intern(tok.lexeme),
+            line=tok.line,
+            column=tok.column,
+            raw_type=tok.type,
+            kind=_KIND_BY_TERMINAL.get(terminal, 0),
+        )
 
 
 class TokenStream:
     def __init__(self, tokens: List[SyntaxToken]):
         self._tokens = tokens
+        # terminal/kind 的平行数组（SoA）：纯前瞻只读这一个字段时
+        # 不必取整个 token 对象再做属性解引用
+        self._terminals = [t.terminal for t in tokens]
+        self._kinds = [t.kind for t in tokens]
+        self._n = len(tokens)
         # 当前读到哪一个 token 的索引
         self._i = 0
+        # 当前 token 的缓存：peek(0) 占前瞻的绝大多数，
+        # 只在 advance/set_index 时更新，省去每次的加法与越界检查
+        self._cur: Optional[SyntaxToken] = tokens[0] if tokens else None
 
     # 看 k 个 token 之后的 token，k=0 表示当前 token，但是不会移动读取位置
     def peek(self, k: int = 0) -> SyntaxToken:
+        if k == 0:
+            return self._cur
         idx = self._i + k
         if idx < 0:
             idx = 0
-        if idx >= len(self._tokens):
+        if idx >= self._n:
             return self._tokens[-1]
         return self._tokens[idx]
 
+    # 只看 k 个 token 之后的终结符：语法分析的大多数前瞻只需要这一个字段
+    def peek_terminal(self, k: int = 0) -> str:
+        idx = self._i + k
+        if idx < 0:
+            idx = 0
+        elif idx >= self._n:
+            idx = self._n - 1
+        return self._terminals[idx]
+
+    # 只看 k 个 token 之后的 kind 位：热路径的运算符判定全走这里，
+    # 整条路径只有一次列表下标、零个对象头解引用
+    def peek_kind(self, k: int = 0) -> int:
+        idx = self._i + k
+        if idx < 0:
+            idx = 0
+        elif idx >= self._n:
+            idx = self._n - 1
+        return self._kinds[idx]
+
     # 返回当前 token，移动到下一个 token
     def advance(self) -> SyntaxToken:
-        tok = self.peek(0)
-        if self._i < len(self._tokens) - 1:
+        tok = self._cur
+        if self._i < self._n - 1:
             self._i += 1
+            self._cur = self._tokens[self._i]
         return tok
 
+    # 从当前位置起最多取 max_n 个 token 的切片：一次 C 层切片，
+    # 供需要整段前瞻的调用方替代逐个 peek(k)
+    def slice_from_current(self, max_n: int) -> List[SyntaxToken]:
+        return self._tokens[self._i : self._i + max_n]
+
     def at_end(self) -> bool:
         return self.peek().terminal == "EOF"
 
@@ -64,7 +162,8 @@ class TokenStream:
         return self._i
 
     def set_index(self, i: int) -> None:
-        self._i = max(0, min(i, len(self._tokens) - 1))
+        self._i = max(0, min(i, self._n - 1))
+        self._cur = self._tokens[self._i]
 
 
 def normalize_tokens(lex_tokens: List[Token], drop_error_tokens: bool = True) -> List[SyntaxToken]:
@@ -79,5 +178,5 @@ def normalize_tokens(lex_tokens: List[Token], drop_error_tokens: bool = True) ->
         eof_line, eof_col = last.line, last.column + max(1, len(last.lexeme))
     else:
         eof_line, eof_col = 1, 1
-    out.append(SyntaxToken(terminal="EOF", lexeme="", line=eof_line, column=eof_col, raw_type="EOF"))
+    out.append(SyntaxToken(terminal="EOF", lexeme="", line=eof_line, column=eof_col, raw_type="EOF", kind=K_EOF))
     return out
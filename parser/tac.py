@@ -1,54 +1,105 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, List, Optional, Tuple
-
-
-# 四元式数据结构
-@dataclass(frozen=True)
+import sys
+from dataclasses import dataclass, field
+from itertools import chain
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+
+# 三地址文本的记忆化格式化：label/goto 等行在循环代码里大量重复，
+# 相同四元组直接复用同一个字符串
+@lru_cache(maxsize=4096)
+def _format_three_address(op: str, arg1: str, arg2: str, result: str) -> str:
+    # 统一展示为三地址/控制流形式
+    if op == "label":
+        return f"{result}:"
+    if op == "goto":
+        return f"goto {result}"
+    if op == "ifFalse":
+        return f"ifFalse {arg1} goto {result}"
+    if op == "if":
+        # arg1: left, arg2: relop right (打包) 或直接条件
+        return f"if {arg1} goto {result}"
+    if op in {"=", "+", "-", "*", "/", "<", "<=", ">", ">=", "==", "!="}:
+        if op == "=":
+            return f"{result} = {arg1}"
+        return f"{result} = {arg1} {op} {arg2}"
+    return f"({op}, {arg1}, {arg2}, {result})"
+
+
+# 临时变量/标号名字池：t1/L1 这类名字在多次解析间完全相同，
+# intern 后跨 emitter 复用同一批字符串，后续相等比较走指针短路
+_TEMP_NAMES: List[str] = []
+_LABEL_NAMES: List[str] = []
+
+
+def _pooled_name(pool: List[str], prefix: str, idx: int) -> str:
+    while len(pool) < idx:
+        pool.append(sys.intern(f"{prefix}{len(pool) + 1}"))
+    return pool[idx - 1]
+
+
+# 报告表头常量：每次渲染不再重复拼三行表头
+_HEADER_TAC = (
+    "========================================\n"
+    "           三地址码\n"
+    "========================================\n\n"
+)
+_HEADER_QUADS = (
+    "========================================\n"
+    "               四元式\n"
+    "========================================\n\n"
+)
+
+
+# 四元式数据结构。slots=True：四个短字符串不再各带一个 __dict__，
+# 大程序里上千条四元式的内存减半，遍历时属性访问也更快
+@dataclass(slots=True)
 class Quad:
     op: str
     arg1: str
     arg2: str
     result: str
+    # 三地址文本的实例级缓存：一个四元式在 trace/as_text/报告里通常要
+    # 格式化 2~4 次，首次之后只剩一次槽位读取
+    _fmt: Optional[str] = field(default=None, repr=False, compare=False)
 
     def format_three_address(self) -> str:
-        # 统一展示为三地址/控制流形式
-        if self.op == "label":
-            return f"{self.result}:"
-        if self.op == "goto":
-            return f"goto {self.result}"
-        if self.op == "ifFalse":
-            return f"ifFalse {self.arg1} goto {self.result}"
-        if self.op == "if":
-            # arg1: left, arg2: relop right (打包) 或直接条件
-            return f"if {self.arg1} goto {self.result}"
-        if self.op in {"=", "+", "-", "*", "/", "<", "<=", ">", ">=", "==", "!="}:
-            if self.op == "=":
-                return f"{self.result} = {self.arg1}"
-            return f"{self.result} = {self.arg1} {self.op} {self.arg2}"
-        return f"({self.op}, {self.arg1}, {self.arg2}, {self.result})"
+        if self._fmt is None:
+            self._fmt = _format_three_address(self.op, self.arg1, self.arg2, self.result)
+        return self._fmt
 
 # 三地址码/四元式生成器
 class TACEmitter:
     def __init__(self) -> None:
         self.quads: List[Quad] = []
-        self.trace: List[str] = []
         self._temp_id = 0
         self._label_id = 0
 
+    @property
+    def trace(self) -> List[str]:
+        """三地址形式的语义日志，按需从 quads 推导。
+
+        emit 时不再同步格式化：不读 trace 的调用方完全不付格式化成本，
+        回填/回卷也只需维护 quads 一份数据。
+        """
+        return [q.format_three_address() for q in self.quads]
+
     def new_temp(self) -> str:
         self._temp_id += 1
-        return f"t{self._temp_id}"
+        return _pooled_name(_TEMP_NAMES, "t", self._temp_id)
 
     def new_label(self) -> str:
         self._label_id += 1
-        return f"L{self._label_id}"
+        return _pooled_name(_LABEL_NAMES, "L", self._label_id)
 
     def emit(self, op: str, arg1: str = "", arg2: str = "", result: str = "") -> None:
-        q = Quad(op=op, arg1=arg1, arg2=arg2, result=result)
-        self.quads.append(q)
-        self.trace.append(q.format_three_address())
+        self.quads.append(Quad(op=op, arg1=arg1, arg2=arg2, result=result))
+
+    def emit_many(self, quad_args: Sequence[Tuple[str, str, str, str]]) -> None:
+        """按序成批生成四元式：一次 extend 替代逐条 emit 的多次方法调用。"""
+        self.quads.extend(Quad(op, a1, a2, r) for op, a1, a2, r in quad_args)
 
     # 特定操作的便捷方法
     def emit_label(self, label: str) -> None:
@@ -60,6 +111,25 @@ class TACEmitter:
     def emit_if_false(self, cond_place: str, label: str) -> None:
         self.emit("ifFalse", arg1=cond_place, result=label)
 
+    # ---------------- checkpoint helpers (检查点回卷) ----------------
+    def mark(self) -> int:
+        """记录当前 quads 的长度，供 extract_since 回卷用。"""
+        return len(self.quads)
+
+    def extract_since(self, mark: int) -> List[Quad]:
+        """取出 mark 之后生成的四元式，并把本体截断回 mark。
+
+        用途：语法上先出现、但中间代码需要延后排布的片段（如 for 的
+        cond/iter），直接写进本 emitter 再整段取出，稍后 replay 回来。
+        """
+        tail = self.quads[mark:]
+        del self.quads[mark:]
+        return tail
+
+    def replay(self, tail: List[Quad]) -> None:
+        """把 extract_since 取出的片段按原顺序追加回当前位置。"""
+        self.quads.extend(tail)
+
     # ---------------- backpatch helpers (拉链回填) ----------------
     def emit_goto_placeholder(self) -> int:
         """生成一个目标未确定的 goto，返回该四元式在 quads 中的下标。"""
@@ -73,42 +143,45 @@ class TACEmitter:
 
     @staticmethod
     def merge_patch_lists(*lists: Iterable[int]) -> List[int]:
-        out: List[int] = []
-        for lst in lists:
-            out.extend(list(lst))
-        return out
+        # chain 惰性串接后一次物化，不再为每个入参复制一份中间列表
+        return list(chain.from_iterable(lists))
 
     def backpatch(self, patch_list: Iterable[int], label: str) -> None:
         """把 patch_list 中的跳转目标统一回填为 label。
 
         约定：patch_list 存的是 self.quads 的下标。
         """
+        quads = self.quads
+        n = len(quads)
         for idx in patch_list:
-            if idx < 0 or idx >= len(self.quads):
+            if idx < 0 or idx >= n:
                 continue
-            q = self.quads[idx]
+            q = quads[idx]
             if q.op not in {"goto", "ifFalse", "if"}:
                 continue
-            patched = Quad(op=q.op, arg1=q.arg1, arg2=q.arg2, result=label)
-            self.quads[idx] = patched
-            # 同步语义日志（RDParser 用 emitter.trace 输出）
-            if 0 <= idx < len(self.trace):
-                self.trace[idx] = patched.format_three_address()
+            # Quad 不再 frozen：就地改写目标，省掉每次回填的重建分配；
+            # trace 由 quads 按需推导，只需作废实例上的格式化缓存
+            q.result = label
+            q._fmt = None
 
     def as_text(self) -> str:
-        lines: List[str] = []
-        lines.append("========================================\n")
-        lines.append("           三地址码\n")
-        lines.append("========================================\n\n")
-        for i, q in enumerate(self.quads, start=1):
-            lines.append(f"{i:04d}: {q.format_three_address()}\n")
-        return "".join(lines)
+        # 表头为模块常量，正文列表推导一次 join
+        body = [f"{i:04d}: {q.format_three_address()}\n" for i, q in enumerate(self.quads, start=1)]
+        return _HEADER_TAC + "".join(body)
 
     def as_quads_text(self) -> str:
-        lines: List[str] = []
-        lines.append("========================================\n")
-        lines.append("               四元式\n")
-        lines.append("========================================\n\n")
+        body = [f"{i:04d}: ({q.op}, {q.arg1}, {q.arg2}, {q.result})\n" for i, q in enumerate(self.quads, start=1)]
+        return _HEADER_QUADS + "".join(body)
+
+    def as_report_text(self) -> str:
+        """三地址码 + 四元式合并报告，一次遍历 quads 同时渲染两段。
+
+        输出与 as_text() + "\\n\\n" + as_quads_text() 完全一致。
+        """
+        tac_lines: List[str] = [_HEADER_TAC]
+        quad_lines: List[str] = ["\n\n", _HEADER_QUADS]
         for i, q in enumerate(self.quads, start=1):
-            lines.append(f"{i:04d}: ({q.op}, {q.arg1}, {q.arg2}, {q.result})\n")
-        return "".join(lines)
+            tac_lines.append(f"{i:04d}: {q.format_three_address()}\n")
+            quad_lines.append(f"{i:04d}: ({q.op}, {q.arg1}, {q.arg2}, {q.result})\n")
+        tac_lines.extend(quad_lines)
+        return "".join(tac_lines)